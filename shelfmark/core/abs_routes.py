@@ -10,10 +10,22 @@ from shelfmark.core.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+# AUTH_METHOD keyed on the security config file's mtime, so it is re-read only after a save
+_AUTH_MODE_CACHE: dict = {"value": None, "mtime": None}
+
+
 def _get_auth_mode() -> str:
     try:
-        from shelfmark.core.settings_registry import load_config_file
-        return load_config_file("security").get("AUTH_METHOD", "none")
+        from shelfmark.core.settings_registry import _get_config_file_path, load_config_file
+        try:
+            mtime = _get_config_file_path("security").stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if _AUTH_MODE_CACHE["value"] is not None and _AUTH_MODE_CACHE["mtime"] == mtime:
+            return _AUTH_MODE_CACHE["value"]
+        auth_mode = load_config_file("security").get("AUTH_METHOD", "none")
+        _AUTH_MODE_CACHE.update(value=auth_mode, mtime=mtime)
+        return auth_mode
     except Exception:
         return "none"
 
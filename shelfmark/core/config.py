@@ -68,6 +68,7 @@ class Config:
         self._user_db_load_attempted = False
         self._initialized = True
         self._loaded = False
+        self._generation = 0
 
     def _ensure_loaded(self) -> None:
         """Ensure settings are loaded from the registry."""
@@ -116,6 +117,13 @@ class Config:
                 self._cache[key] = value
 
         self._loaded = True
+        self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped every time settings are (re)loaded; lets callers cache derived values."""
+        self._ensure_loaded()
+        return self._generation
 
     def refresh(self) -> None:
         """
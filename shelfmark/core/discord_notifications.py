@@ -5,59 +5,155 @@ Fires rich embeds to a Discord channel on:
 - Book fulfilled / available (fulfilled notification)
 """
 
-import json
-import urllib.error
-import urllib.request
-from typing import Optional
+from typing import Any, NamedTuple, Optional, Sequence
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from shelfmark.core.config import config
 from shelfmark.core.logger import setup_logger
+from shelfmark.core.notification_queue import enqueue_batched
 
 logger = setup_logger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Discord accepts at most 10 embeds in one webhook message
+_MAX_EMBEDS_PER_MESSAGE = 10
+
+# Longest Retry-After we will wait out; a longer rate limit gives up on the message
+_MAX_RETRY_AFTER_SECONDS = 10
+
+
+class _WebhookRetry(Retry):
+    """Retry that gives up rather than sleeping through a long Discord rate limit."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > _MAX_RETRY_AFTER_SECONDS:
+                raise MaxRetryError(_pool, url, ResponseError(f"Retry-After {retry_after:.0f}s"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+# Shared keep-alive session so back-to-back webhook posts reuse the TLS connection.
+# A webhook POST is not idempotent, so only failures where Discord cannot have
+# posted the message are retried: connection errors, 503, and 429 after its
+# Retry-After. Read timeouts and 502/504 may follow a delivered message and are
+# never retried. urllib3 resends the already-encoded body on each attempt.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=_WebhookRetry(
+        total=2,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=(429, 503),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    ),
+))
+
 _DISCORD_COLOR_NEW_REQUEST = 0x5865F2   # Discord blurple
 _DISCORD_COLOR_AVAILABLE   = 0x57F287   # Discord green
 
-_VALID_WEBHOOK_PREFIXES = (
-    "https://discord.com/api/webhooks/",
-    "https://discordapp.com/api/webhooks/",
+# Every host Discord issues webhook URLs on, including the PTB and Canary clients.
+# One startswith(tuple) call also pins the scheme to https and the path to /api/webhooks/.
+_VALID_WEBHOOK_PREFIXES = tuple(
+    f"https://{host}/api/webhooks/"
+    for host in (
+        "discord.com",
+        "discordapp.com",
+        "ptb.discord.com",
+        "canary.discord.com",
+        "ptb.discordapp.com",
+        "canary.discordapp.com",
+    )
 )
 
 
-def _is_enabled() -> bool:
-    try:
-        import shelfmark.core.config as core_config
-        return bool(core_config.config.get("DISCORD_WEBHOOK_ENABLED", False))
-    except Exception:
-        return False
+_HTTP_PREFIXES = ("http://", "https://")
+
+
+class _DiscordSettings(NamedTuple):
+    enabled: bool = False
+    webhook_url: Optional[str] = None
+    notify_new_request: bool = True
+    notify_book_available: bool = True
 
 
-def _get_webhook_url() -> Optional[str]:
+# (config generation, settings) — rebuilt only after the config is refreshed
+_settings_cache: Optional[tuple[int, _DiscordSettings]] = None
+
+
+def _load_discord_settings() -> _DiscordSettings:
+    """Return all Discord settings from one cached snapshot of the config."""
+    global _settings_cache
     try:
-        import shelfmark.core.config as core_config
-        url = (core_config.config.get("DISCORD_WEBHOOK_URL", "") or "").strip()
-        if url and any(url.startswith(p) for p in _VALID_WEBHOOK_PREFIXES):
-            return url
-        if url:
+        generation = config.generation
+        cached = _settings_cache
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        url = (config.get("DISCORD_WEBHOOK_URL", "") or "").strip()
+        if url and not url.startswith(_VALID_WEBHOOK_PREFIXES):
             logger.warning("DISCORD_WEBHOOK_URL looks invalid, skipping")
-        return None
+            url = ""
+        settings = _DiscordSettings(
+            enabled=bool(config.get("DISCORD_WEBHOOK_ENABLED", False)),
+            webhook_url=url or None,
+            notify_new_request=bool(config.get("DISCORD_NOTIFY_NEW_REQUEST", True)),
+            notify_book_available=bool(config.get("DISCORD_NOTIFY_BOOK_AVAILABLE", True)),
+        )
+        _settings_cache = (generation, settings)
+        return settings
     except Exception:
-        return None
+        return _DiscordSettings()
 
 
-def _get_notify_new_request() -> bool:
-    try:
-        import shelfmark.core.config as core_config
-        return bool(core_config.config.get("DISCORD_NOTIFY_NEW_REQUEST", True))
-    except Exception:
-        return True
+def new_request_notifications_enabled() -> bool:
+    """True when a new-request embed would actually be sent, so callers can skip gathering its inputs."""
+    settings = _load_discord_settings()
+    return bool(settings.enabled and settings.notify_new_request and settings.webhook_url)
 
 
-def _get_notify_book_available() -> bool:
-    try:
-        import shelfmark.core.config as core_config
-        return bool(core_config.config.get("DISCORD_NOTIFY_BOOK_AVAILABLE", True))
-    except Exception:
-        return True
+def book_available_notifications_enabled() -> bool:
+    """True when a book-available embed would actually be sent."""
+    settings = _load_discord_settings()
+    return bool(settings.enabled and settings.notify_book_available and settings.webhook_url)
+
+
+# Embed heading and sidebar colour per notification kind
+_EMBED_KINDS = {
+    "new_request": ("🔖 New Book Request", _DISCORD_COLOR_NEW_REQUEST),
+    "available": ("📗 Book Now Available", _DISCORD_COLOR_AVAILABLE),
+}
+
+
+def _build_embed(
+    kind: str,
+    title: str,
+    optional_fields: tuple[tuple[str, Any], ...],
+    cover_url: Optional[str],
+) -> dict:
+    """Build an embed of ``kind``: Title first, then the (name, value) pairs whose value is set."""
+    heading, color = _EMBED_KINDS[kind]
+    embed: dict = {
+        "title": heading,
+        "color": color,
+        "fields": [
+            {"name": "Title", "value": title, "inline": True},
+            *({"name": name, "value": value, "inline": True} for name, value in optional_fields if value),
+        ],
+    }
+    if cover_url and cover_url.startswith(_HTTP_PREFIXES):
+        embed["thumbnail"] = {"url": cover_url}
+    return embed
 
 
 def build_new_request_embed(
@@ -69,23 +165,12 @@ def build_new_request_embed(
     prefer_alternate_version: bool = False,
 ) -> dict:
     """Build a Discord embed dict for a new book request."""
-    fields = [{"name": "Title", "value": title, "inline": True}]
-    if author:
-        fields.append({"name": "Author", "value": author, "inline": True})
-    fields.append({"name": "Type", "value": content_type, "inline": True})
-    if requester:
-        fields.append({"name": "Requested by", "value": requester, "inline": True})
-    if prefer_alternate_version:
-        fields.append({"name": "Version", "value": "Prefers graphic/dramatized", "inline": True})
-
-    embed: dict = {
-        "title": "🔖 New Book Request",
-        "color": _DISCORD_COLOR_NEW_REQUEST,
-        "fields": fields,
-    }
-    if cover_url and (cover_url.startswith("http://") or cover_url.startswith("https://")):
-        embed["thumbnail"] = {"url": cover_url}
-    return embed
+    return _build_embed("new_request", title, (
+        ("Author", author),
+        ("Type", content_type),
+        ("Requested by", requester),
+        ("Version", prefer_alternate_version and "Prefers graphic/dramatized"),
+    ), cover_url)
 
 
 def build_book_available_embed(
@@ -95,41 +180,30 @@ def build_book_available_embed(
     cover_url: Optional[str] = None,
 ) -> dict:
     """Build a Discord embed dict for a book now available."""
-    fields = [{"name": "Title", "value": title, "inline": True}]
-    if author:
-        fields.append({"name": "Author", "value": author, "inline": True})
-    if requester:
-        fields.append({"name": "Requested by", "value": requester, "inline": True})
-
-    embed: dict = {
-        "title": "📗 Book Now Available",
-        "color": _DISCORD_COLOR_AVAILABLE,
-        "fields": fields,
-    }
-    if cover_url and (cover_url.startswith("http://") or cover_url.startswith("https://")):
-        embed["thumbnail"] = {"url": cover_url}
-    return embed
+    return _build_embed("available", title, (
+        ("Author", author),
+        ("Requested by", requester),
+    ), cover_url)
 
 
 def _post_embed(webhook_url: str, embed: dict) -> bool:
     """POST a single embed to a Discord webhook URL. Returns True on success."""
-    payload = json.dumps({"embeds": [embed]}).encode("utf-8")
-    req = urllib.request.Request(
-        webhook_url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+    return _post_embeds(webhook_url, [embed])
+
+
+def _post_embeds(webhook_url: str, embeds: list[dict]) -> bool:
+    """POST up to 10 embeds as one Discord webhook message. Returns True on success."""
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            resp.read()
-        return True
-    except urllib.error.HTTPError as e:
-        logger.warning(f"Discord webhook HTTP error {e.code}: {e.read()[:200]}")
-        return False
+        resp = _session.post(
+            webhook_url, data=orjson.dumps({"embeds": embeds}), headers=_JSON_HEADERS, timeout=10,
+        )
     except Exception as e:
         logger.warning(f"Discord webhook failed: {e}")
         return False
+    if not resp.ok:
+        logger.warning(f"Discord webhook HTTP error {resp.status_code}: {resp.text[:200]}")
+        return False
+    return True
 
 
 def send_discord_new_request(
@@ -142,12 +216,9 @@ def send_discord_new_request(
 ) -> bool:
     """Send a Discord embed when a new book request is created. Best-effort; never raises."""
     try:
-        if not _is_enabled():
-            return False
-        if not _get_notify_new_request():
-            return False
-        webhook_url = _get_webhook_url()
-        if not webhook_url:
+        settings = _load_discord_settings()
+        webhook_url = settings.webhook_url
+        if not (settings.enabled and settings.notify_new_request and webhook_url):
             return False
         embed = build_new_request_embed(
             title=title, author=author, requester=requester,
@@ -171,12 +242,9 @@ def send_discord_book_available(
 ) -> bool:
     """Send a Discord embed when a requested book is fulfilled. Best-effort; never raises."""
     try:
-        if not _is_enabled():
-            return False
-        if not _get_notify_book_available():
-            return False
-        webhook_url = _get_webhook_url()
-        if not webhook_url:
+        settings = _load_discord_settings()
+        webhook_url = settings.webhook_url
+        if not (settings.enabled and settings.notify_book_available and webhook_url):
             return False
         embed = build_book_available_embed(
             title=title, author=author, requester=requester, cover_url=cover_url,
@@ -190,12 +258,86 @@ def send_discord_book_available(
         return False
 
 
+def send_discord_embeds(embeds: list[dict]) -> bool:
+    """Send embeds to the configured webhook, 10 per message. Best-effort; never raises.
+
+    Returns True only if every message was accepted.
+    """
+    try:
+        settings = _load_discord_settings()
+        webhook_url = settings.webhook_url
+        if not (embeds and settings.enabled and webhook_url):
+            return False
+        ok = True
+        for start in range(0, len(embeds), _MAX_EMBEDS_PER_MESSAGE):
+            ok = _post_embeds(webhook_url, embeds[start:start + _MAX_EMBEDS_PER_MESSAGE]) and ok
+        if ok:
+            logger.info(f"Discord notification sent with {len(embeds)} embed(s)")
+        return ok
+    except Exception as e:
+        logger.warning(f"Discord send_discord_embeds failed: {e}")
+        return False
+
+
+def send_discord_bulk_available(
+    books: Sequence[tuple[str, Optional[str], Optional[str]]],
+) -> bool:
+    """Send one book-available embed per ``(title, author, requester)``, 10 per webhook call.
+
+    Best-effort; never raises. Returns True only if every message was accepted.
+    """
+    try:
+        if not books or not book_available_notifications_enabled():
+            return False
+        return send_discord_embeds([
+            build_book_available_embed(title=title, author=author, requester=requester)
+            for title, author, requester in books
+        ])
+    except Exception as e:
+        logger.warning(f"Discord send_discord_bulk_available failed: {e}")
+        return False
+
+
+def queue_discord_new_request(
+    title: str,
+    author: Optional[str] = None,
+    requester: Optional[str] = None,
+    content_type: str = "ebook",
+    cover_url: Optional[str] = None,
+    prefer_alternate_version: bool = False,
+) -> bool:
+    """Queue a new-request embed for batched background delivery. Returns True if queued."""
+    if not new_request_notifications_enabled():
+        return False
+    embed = build_new_request_embed(
+        title=title, author=author, requester=requester,
+        content_type=content_type, cover_url=cover_url,
+        prefer_alternate_version=prefer_alternate_version,
+    )
+    return enqueue_batched("Discord", send_discord_embeds, embed)
+
+
+def queue_discord_book_available(
+    title: str,
+    author: Optional[str] = None,
+    requester: Optional[str] = None,
+    cover_url: Optional[str] = None,
+) -> bool:
+    """Queue a book-available embed for batched background delivery. Returns True if queued."""
+    if not book_available_notifications_enabled():
+        return False
+    embed = build_book_available_embed(
+        title=title, author=author, requester=requester, cover_url=cover_url,
+    )
+    return enqueue_batched("Discord", send_discord_embeds, embed)
+
+
 def test_discord_connection(current_values: dict) -> dict:
     """Test Discord webhook using current form values. Used as a settings ActionButton callback."""
     webhook_url = (current_values.get("DISCORD_WEBHOOK_URL") or "").strip()
     if not webhook_url:
         return {"success": False, "message": "Webhook URL is required"}
-    if not any(webhook_url.startswith(p) for p in _VALID_WEBHOOK_PREFIXES):
+    if not webhook_url.startswith(_VALID_WEBHOOK_PREFIXES):
         return {"success": False, "message": "URL must start with https://discord.com/api/webhooks/"}
 
     embed = {
@@ -203,16 +345,11 @@ def test_discord_connection(current_values: dict) -> dict:
         "description": "Discord webhook is configured correctly.",
         "color": _DISCORD_COLOR_NEW_REQUEST,
     }
-    payload = json.dumps({"embeds": [embed]}).encode("utf-8")
-    req = urllib.request.Request(
-        webhook_url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
     try:
-        with urllib.request.urlopen(req, timeout=10) as req_obj:
-            req_obj.read()
+        resp = _session.post(
+            webhook_url, data=orjson.dumps({"embeds": [embed]}), headers=_JSON_HEADERS, timeout=10,
+        )
+        resp.raise_for_status()
         return {"success": True, "message": "Test notification sent to Discord"}
     except Exception as e:
         return {"success": False, "message": f"Discord test failed: {e}"}
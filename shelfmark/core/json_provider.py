@@ -0,0 +1,50 @@
+"""Flask JSON provider backed by orjson."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Datetimes go through Flask's default hook, so they keep their RFC 822 rendering
+_BASE_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's provider used by jsonify and request.get_json.
+
+    Output matches the default provider's compact form (sorted keys, same
+    ``default`` hook), except non-ASCII text is emitted as UTF-8 instead of
+    ``\\uXXXX`` escapes. Anything orjson can't encode, or any call with extra
+    ``json.dumps`` arguments, falls back to the stdlib implementation.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.pop("indent", None)
+        separators = kwargs.pop("separators", None)
+        if kwargs or indent not in (None, 2) or separators not in (None, (",", ":")):
+            return super().dumps(obj, indent=indent, separators=separators, **kwargs)
+
+        option = _BASE_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder handles
+            return super().dumps(obj, indent=indent, separators=separators)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install_json_provider(app: Flask) -> None:
+    """Use orjson for the app's JSON encoding and decoding."""
+    app.json_provider_class = OrjsonProvider
+    app.json = OrjsonProvider(app)
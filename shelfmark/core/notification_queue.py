@@ -0,0 +1,104 @@
+"""Background dispatch queue for best-effort webhook notifications.
+
+Route handlers enqueue sends here and return immediately, so a slow or
+unreachable webhook never holds a Flask worker for its HTTP timeout.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from shelfmark.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Bounded so a stalled webhook cannot grow memory without limit
+_QUEUE_MAXSIZE = 256
+# Most queued jobs handled per worker tick; batchable jobs in one tick share a single call
+_MAX_BATCH = 10
+# How long a tick holding a batchable job waits for more to arrive before flushing,
+# so bursts (bulk approve, several quick requests) go out as one webhook call
+_BATCH_LINGER_SECONDS = 0.25
+
+# (label, func, args, batched)
+_Job = tuple[str, Callable[..., Any], tuple[Any, ...], bool]
+
+_queue: "queue.Queue[_Job]" = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _call(label: str, func: Callable[..., Any], *args: Any) -> None:
+    try:
+        func(*args)
+    except Exception as e:
+        logger.warning(f"{label} notification failed: {e}")
+
+
+def _process(jobs: list[_Job]) -> None:
+    """Run plain jobs in order; collapse batched jobs sharing a function into one call."""
+    batches: dict[Callable[..., Any], tuple[str, list[Any]]] = {}
+    for label, func, args, batched in jobs:
+        if batched:
+            batches.setdefault(func, (label, []))[1].append(args[0])
+        else:
+            _call(label, func, *args)
+    for func, (label, items) in batches.items():
+        _call(label, func, items)
+
+
+def _run() -> None:
+    while True:
+        job = _queue.get()
+        jobs = [job]
+        batched = job[3]
+        deadline = time.monotonic() + _BATCH_LINGER_SECONDS
+        while len(jobs) < _MAX_BATCH:
+            remaining = deadline - time.monotonic() if batched else 0
+            try:
+                job = _queue.get(timeout=remaining) if remaining > 0 else _queue.get_nowait()
+            except queue.Empty:
+                break
+            jobs.append(job)
+            batched = batched or job[3]
+        try:
+            _process(jobs)
+        finally:
+            for _ in jobs:
+                _queue.task_done()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, daemon=True, name="notification-dispatch")
+            _worker.start()
+
+
+def _put(job: _Job) -> bool:
+    _ensure_worker()
+    try:
+        _queue.put_nowait(job)
+        return True
+    except queue.Full:
+        logger.warning(f"Notification queue full, dropping {job[0]} notification")
+        return False
+
+
+def enqueue_notification(label: str, func: Callable[..., Any], *args: Any) -> bool:
+    """Queue ``func(*args)`` to run on the dispatch thread. Returns False if dropped."""
+    return _put((label, func, args, False))
+
+
+def enqueue_batched(label: str, batch_func: Callable[[list[Any]], Any], item: Any) -> bool:
+    """Queue ``item`` for ``batch_func``; items queued close together are passed as one list."""
+    return _put((label, batch_func, (item,), True))
+
+
+def wait_until_idle() -> None:
+    """Block until every queued notification has been processed."""
+    _queue.join()
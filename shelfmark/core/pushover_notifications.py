@@ -1,33 +1,59 @@
 """Pushover push notifications for admin: fires when a new book request is submitted."""
 
-import urllib.error
-import urllib.parse
-import urllib.request
-from typing import Optional
+from typing import NamedTuple, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from shelfmark.core.config import config
 from shelfmark.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 _PUSHOVER_API_URL = "https://api.pushover.net/1/messages.json"
 
+# Shared keep-alive session so consecutive notifications reuse the TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
 
-def _is_enabled() -> bool:
+
+class _PushoverSettings(NamedTuple):
+    enabled: bool = False
+    user_key: Optional[str] = None
+    api_token: Optional[str] = None
+
+
+# (config generation, settings) — rebuilt only after the config is refreshed
+_settings_cache: Optional[tuple[int, _PushoverSettings]] = None
+
+
+def _load_pushover_settings() -> _PushoverSettings:
+    """Return all Pushover settings from one cached snapshot of the config."""
+    global _settings_cache
     try:
-        import shelfmark.core.config as core_config
-        return bool(core_config.config.get("PUSHOVER_ENABLED", False))
+        generation = config.generation
+        cached = _settings_cache
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        settings = _PushoverSettings(
+            enabled=bool(config.get("PUSHOVER_ENABLED", False)),
+            user_key=config.get("PUSHOVER_USER_KEY", "") or None,
+            api_token=config.get("PUSHOVER_API_TOKEN", "") or None,
+        )
+        _settings_cache = (generation, settings)
+        return settings
     except Exception:
-        return False
+        return _PushoverSettings()
+
+
+def _is_enabled() -> bool:
+    return _load_pushover_settings().enabled
 
 
 def _get_credentials() -> tuple[Optional[str], Optional[str]]:
-    try:
-        import shelfmark.core.config as core_config
-        user_key = core_config.config.get("PUSHOVER_USER_KEY", "") or None
-        api_token = core_config.config.get("PUSHOVER_API_TOKEN", "") or None
-        return user_key, api_token
-    except Exception:
-        return None, None
+    settings = _load_pushover_settings()
+    return settings.user_key, settings.api_token
 
 
 def send_new_request_pushover(
@@ -64,21 +90,14 @@ def send_new_request_pushover(
             lines.append(f"Requested by {requester}")
         message = "\n".join(lines)
 
-        payload = urllib.parse.urlencode({
+        resp = _session.post(_PUSHOVER_API_URL, data={
             "token": api_token,
             "user": user_key,
             "title": "New Request",
             "message": message,
             "priority": "0",
-        }).encode()
-
-        req = urllib.request.Request(
-            _PUSHOVER_API_URL,
-            data=payload,
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            resp.read()
+        }, timeout=10)
+        resp.raise_for_status()
 
         logger.info(f"Pushover notification sent for new request: {title!r}")
         return True
@@ -100,21 +119,14 @@ def test_pushover_connection(current_values: dict) -> dict:
         return {"success": False, "message": "User Key and API Token are required"}
 
     try:
-        payload = urllib.parse.urlencode({
+        resp = _session.post(_PUSHOVER_API_URL, data={
             "token": api_token,
             "user": user_key,
             "title": "Shelfmark Test",
             "message": "Pushover is configured correctly.",
             "priority": "0",
-        }).encode()
-
-        req = urllib.request.Request(
-            _PUSHOVER_API_URL,
-            data=payload,
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            resp.read()
+        }, timeout=10)
+        resp.raise_for_status()
 
         return {"success": True, "message": "Test notification sent"}
 
@@ -1,22 +1,26 @@
 """SQLite request database for book/audiobook request workflow."""
 
+import itertools
+import queue
 import sqlite3
-import threading
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from shelfmark.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+_ALLOWED_URL_PREFIXES = ("http://", "https://")
+
+
 def _sanitize_url(url: Optional[str]) -> Optional[str]:
     """Return url only if it uses http:// or https://, else None."""
-    if url and (url.startswith("http://") or url.startswith("https://")):
-        return url
-    return None
+    return url if url and url.startswith(_ALLOWED_URL_PREFIXES) else None
 
 
-_VALID_STATUSES = (
+# Ordered for presentation (get_request_counts); membership checks use the sets.
+_VALID_STATUSES_ORDER = (
     "pending",
     "approved",
     "denied",
@@ -26,7 +30,169 @@ _VALID_STATUSES = (
     "cancelled",
     "prerelease_requested",
 )
-_VALID_CONTENT_TYPES = ("ebook", "audiobook")
+_VALID_STATUSES = frozenset(_VALID_STATUSES_ORDER)
+_VALID_CONTENT_TYPES = frozenset(("ebook", "audiobook"))
+
+# sqlite3 caches prepared statements per connection, keyed by SQL text. The
+# queries below are kept to a fixed set of strings so repeat calls reuse the
+# prepared statement instead of re-parsing and re-planning it.
+_STATEMENT_CACHE_SIZE = 256
+
+# Memory-map up to 256 MB of the database so reads come straight from the OS
+# page cache instead of being copied into SQLite's own buffers.
+_MMAP_SIZE = 256 * 1024 * 1024
+
+# Idle connections kept open for reuse. Extra connections opened during a
+# burst of concurrent calls are closed when returned instead of pooled.
+_POOL_SIZE = 8
+
+
+def _build_update_sql(
+    fixed_sets: Tuple[str, ...], optional_columns: Tuple[str, ...]
+) -> Dict[Tuple[bool, ...], str]:
+    """Precompute one UPDATE statement per combination of optional columns."""
+    variants: Dict[Tuple[bool, ...], str] = {}
+    for flags in itertools.product((False, True), repeat=len(optional_columns)):
+        sets = list(fixed_sets)
+        sets.extend(f"{column} = ?" for column, enabled in zip(optional_columns, flags) if enabled)
+        variants[flags] = f"UPDATE requests SET {', '.join(sets)} WHERE id = ? RETURNING *"
+    return variants
+
+
+_UPDATE_STATUS_SQL = _build_update_sql(
+    ("status = ?", "updated_at = CURRENT_TIMESTAMP"),
+    ("admin_note", "approved_by", "download_task_id"),
+)
+_UPDATE_METADATA_SQL = _build_update_sql(
+    ("updated_at = CURRENT_TIMESTAMP",),
+    ("provider", "provider_id", "expected_release_date", "is_released"),
+)
+
+
+_BULK_INSERT_COLUMNS = (
+    "user_id", "title", "content_type", "author", "year", "cover_url", "description",
+    "isbn_10", "isbn_13", "provider", "provider_id", "series_name", "series_position",
+    "prefer_alternate_version", "is_manual_request", "is_released", "title_lower",
+)
+# Stay under SQLite's historical 999 bound-parameter limit per statement.
+_BULK_INSERT_CHUNK = 999 // len(_BULK_INSERT_COLUMNS)
+
+
+def _bulk_insert_sql(row_count: int) -> str:
+    placeholders = "(" + ", ".join("?" * len(_BULK_INSERT_COLUMNS)) + ")"
+    return (
+        f"INSERT INTO requests ({', '.join(_BULK_INSERT_COLUMNS)}) "
+        f"VALUES {', '.join([placeholders] * row_count)} RETURNING id"
+    )
+
+
+def _bulk_insert_params(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Map a create_request-style dict to _BULK_INSERT_COLUMNS order."""
+    content_type = row.get("content_type", "ebook")
+    if content_type not in _VALID_CONTENT_TYPES:
+        raise ValueError(f"Invalid content_type: {content_type}")
+    is_released = row.get("is_released")
+    return (
+        row["user_id"], row["title"], content_type, row.get("author"), row.get("year"),
+        _sanitize_url(row.get("cover_url")), row.get("description"),
+        row.get("isbn_10"), row.get("isbn_13"), row.get("provider"), row.get("provider_id"),
+        row.get("series_name"), row.get("series_position"),
+        1 if row.get("prefer_alternate_version") else 0,
+        1 if row.get("is_manual_request") else 0,
+        None if is_released is None else (1 if is_released else 0),
+        row["title"].lower(),
+    )
+
+
+# Name columns that _get_request's JOIN adds, looked up for a row returned by
+# INSERT/UPDATE ... RETURNING (which can't join).
+_USER_NAMES_SQL = """
+    SELECT u.username AS requester_username, u.display_name AS requester_display_name,
+           a.username AS handled_by_username, a.display_name AS handled_by_display_name
+    FROM users u
+    LEFT JOIN users a ON a.id = ?
+    WHERE u.id = ?"""
+
+
+def _where(conditions: List[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def _build_list_sql(keyset: bool = False) -> Dict[Tuple[bool, ...], str]:
+    """Precompute list SQL keyed by (has_user, has_status, exclude_hidden[, has_cursor]).
+
+    The offset variants end in ``LIMIT ? OFFSET ?``; the keyset variants seek
+    past a ``(created_at, id)`` cursor and end in ``LIMIT ?``.
+    """
+    variants: Dict[Tuple[bool, ...], str] = {}
+    for flags in itertools.product((False, True), repeat=4 if keyset else 3):
+        has_user, has_status, exclude_hidden = flags[:3]
+        conditions = []
+        if has_user:
+            conditions.append("r.user_id = ?")
+        if exclude_hidden:
+            conditions.append("(r.hidden_from_admin = 0 OR r.hidden_from_admin IS NULL)")
+        if has_status:
+            conditions.append("r.status = ?")
+        if keyset and flags[3]:
+            conditions.append("(r.created_at, r.id) < (?, ?)")
+        variants[flags] = f"""
+            SELECT r.*, u.username AS requester_username, u.display_name AS requester_display_name,
+                   a.username AS handled_by_username, a.display_name AS handled_by_display_name
+            FROM requests r
+            JOIN users u ON r.user_id = u.id
+            LEFT JOIN users a ON r.approved_by = a.id
+            {_where(conditions)}
+            ORDER BY r.created_at DESC, r.id DESC
+            {"LIMIT ?" if keyset else "LIMIT ? OFFSET ?"}"""
+    return variants
+
+
+def _build_count_sql() -> Dict[Tuple[bool, bool], str]:
+    """Precompute count_requests SQL keyed by (has_user, has_status)."""
+    variants: Dict[Tuple[bool, bool], str] = {}
+    for has_user, has_status in itertools.product((False, True), repeat=2):
+        conditions = []
+        if has_user:
+            conditions.append("user_id = ?")
+        if has_status:
+            conditions.append("status = ?")
+        variants[(has_user, has_status)] = (
+            f"SELECT COUNT(*) AS cnt FROM requests {_where(conditions)}".rstrip()
+        )
+    return variants
+
+
+_LIST_SQL = _build_list_sql()
+_LIST_KEYSET_SQL = _build_list_sql(keyset=True)
+_COUNT_SQL = _build_count_sql()
+
+# One row with a column per status plus the total; SUM over no rows is NULL,
+# hence the COALESCE.
+_STATUS_COUNTS_SQL = "SELECT {}, COUNT(*) AS total FROM requests".format(
+    ", ".join(
+        f"COALESCE(SUM(status = '{status}'), 0) AS {status}"
+        for status in _VALID_STATUSES_ORDER
+    )
+)
+
+# Statuses that block a user from filing the same request again.
+_ACTIVE_STATUSES = ("pending", "approved", "downloading", "prerelease_requested")
+_ACTIVE_STATUSES_SQL = ", ".join(f"'{status}'" for status in _ACTIVE_STATUSES)
+
+_DUPLICATE_BY_PROVIDER_SQL = f"""
+SELECT 1 FROM requests
+WHERE user_id = ? AND status IN ({_ACTIVE_STATUSES_SQL})
+  AND provider = ? AND provider_id = ? AND content_type = ?
+LIMIT 1
+"""
+
+_DUPLICATE_BY_TITLE_SQL = f"""
+SELECT 1 FROM requests
+WHERE user_id = ? AND status IN ({_ACTIVE_STATUSES_SQL})
+  AND title_lower = ? AND content_type = ?
+LIMIT 1
+"""
 
 _CREATE_REQUESTS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS requests (
@@ -55,30 +221,147 @@ CREATE TABLE IF NOT EXISTS requests (
 );
 """
 
+# Created after migrations: the table rebuilds in migrations 2 and 6 drop
+# any indexes, and hidden_from_admin only exists from migration 1 onwards.
+_CREATE_REQUESTS_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_requests_created
+ON requests (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_requests_user_created
+ON requests (user_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_requests_status_created
+ON requests (status, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_requests_user_updated
+ON requests (user_id, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_requests_download_task
+ON requests (download_task_id) WHERE download_task_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_requests_active_provider
+ON requests (user_id, status, provider, provider_id, content_type);
+
+CREATE INDEX IF NOT EXISTS idx_requests_active_title
+ON requests (user_id, status, title_lower, content_type);
+"""
+
+
+class RequestRow(sqlite3.Row):
+    """Row returned by the list methods: mapping access without a per-row dict copy.
+
+    Adds dict-style ``get`` so callers can read optional columns the same way
+    they would on a request dict. Convert with ``dict(row)`` before serializing.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except IndexError:
+            return default
+
+
+def _close_connection(conn: sqlite3.Connection) -> None:
+    """Run PRAGMA optimize and close ``conn``, ignoring errors from a broken connection."""
+    try:
+        # Refresh planner statistics the connection found stale.
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
 
 class RequestDB:
-    """Thread-safe SQLite request database (shares users.db)."""
+    """Thread-safe SQLite request database (shares users.db).
+
+    Configured connections live in a small LIFO pool and are checked out for
+    the duration of each call, so threads and gevent greenlets alike reuse a
+    few long-lived connections instead of opening one per request.
+    Concurrent writers are serialized by SQLite itself (WAL + busy_timeout);
+    writes that read their own result take the write lock up front with
+    BEGIN IMMEDIATE so they never hit SQLITE_BUSY at COMMIT.
+    """
 
     def __init__(self, db_path: str):
         self._db_path = db_path
-        self._lock = threading.Lock()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=_POOL_SIZE)
+        # journal_mode is persisted in the database file, so it only needs
+        # to be set until initialize() has switched the file to WAL once.
+        self._wal_initialized = False
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
+        """Open a new connection with the request database PRAGMAs applied."""
+        # Pooled connections move between threads, so sqlite3's same-thread
+        # check is off; the pool hands each one to a single caller at a time.
+        conn = sqlite3.connect(
+            self._db_path,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            # Autocommit: one-statement writes commit on their own; multi-step
+            # writes open their own BEGIN IMMEDIATE transaction.
+            isolation_level=None,
+        )
+        conn.row_factory = RequestRow
+        if not self._wal_initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA cache_size=-8000")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
 
-    def initialize(self) -> None:
-        """Create requests table if it doesn't exist, then run migrations."""
-        with self._lock:
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out an idle pooled connection for one call, opening one if none is free."""
+        pool = self._pool
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
             conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._release(pool, conn)
+
+    def _release(self, pool: "queue.LifoQueue[sqlite3.Connection]", conn: sqlite3.Connection) -> None:
+        """Return a checked-out connection to its pool, or close it if the pool is full or closed."""
+        if conn.in_transaction:
+            conn.rollback()
+        # Connections checked out before close() are not handed to the new pool.
+        if pool is self._pool:
             try:
-                conn.executescript(_CREATE_REQUESTS_TABLE_SQL)
+                pool.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        _close_connection(conn)
+
+    def close(self) -> None:
+        """Run PRAGMA optimize and close every idle pooled connection."""
+        pool, self._pool = self._pool, queue.LifoQueue(maxsize=_POOL_SIZE)
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_connection(conn)
+
+    def initialize(self) -> None:
+        """Create requests table if it doesn't exist, run migrations, then build indexes."""
+        with self._connection() as conn:
+            conn.executescript(_CREATE_REQUESTS_TABLE_SQL)
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
                 self._run_migrations(conn)
-                conn.commit()
-            finally:
-                conn.close()
+            conn.executescript(_CREATE_REQUESTS_INDEXES_SQL)
+            conn.execute("ANALYZE requests")
+            conn.execute("PRAGMA optimize")
+        self._wal_initialized = True
         logger.info("Request database initialized")
 
     def _run_migrations(self, conn: sqlite3.Connection) -> None:
@@ -111,7 +394,9 @@ class RequestDB:
             ).fetchone()
             if table_sql and "'cancelled'" not in table_sql["sql"]:
                 logger.info("Migration 2: Adding 'cancelled' to status CHECK constraint")
-                conn.executescript("""
+                self._rebuild_requests_table(
+                    conn,
+                    """
                     CREATE TABLE IF NOT EXISTS requests_new (
                         id              INTEGER PRIMARY KEY AUTOINCREMENT,
                         user_id         INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
@@ -135,16 +420,15 @@ class RequestDB:
                         created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         hidden_from_admin INTEGER DEFAULT 0
-                    );
-                    INSERT INTO requests_new SELECT
+                    )
+                    """,
+                    """
                         id, user_id, status, content_type, title, author, year,
                         cover_url, description, isbn_10, isbn_13, provider, provider_id,
                         series_name, series_position, admin_note, approved_by,
                         download_task_id, created_at, updated_at, hidden_from_admin
-                    FROM requests;
-                    DROP TABLE requests;
-                    ALTER TABLE requests_new RENAME TO requests;
-                """)
+                    """,
+                )
             conn.execute("UPDATE schema_version SET version = 2")
 
         if current_version < 3:
@@ -194,7 +478,9 @@ class RequestDB:
                 logger.info(
                     "Migration 6: Adding 'prerelease_requested' to status CHECK constraint"
                 )
-                conn.executescript("""
+                self._rebuild_requests_table(
+                    conn,
+                    """
                     CREATE TABLE IF NOT EXISTS requests_new (
                         id              INTEGER PRIMARY KEY AUTOINCREMENT,
                         user_id         INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
@@ -222,20 +508,62 @@ class RequestDB:
                         is_manual_request INTEGER DEFAULT 0,
                         is_released INTEGER DEFAULT NULL,
                         expected_release_date TEXT DEFAULT NULL
-                    );
-                    INSERT INTO requests_new SELECT
+                    )
+                    """,
+                    """
                         id, user_id, status, content_type, title, author, year,
                         cover_url, description, isbn_10, isbn_13, provider, provider_id,
                         series_name, series_position, admin_note, approved_by,
                         download_task_id, created_at, updated_at, hidden_from_admin,
                         prefer_alternate_version, is_manual_request, is_released,
                         expected_release_date
-                    FROM requests;
-                    DROP TABLE requests;
-                    ALTER TABLE requests_new RENAME TO requests;
-                """)
+                    """,
+                )
             conn.execute("UPDATE schema_version SET version = 6")
 
+        if current_version < 7:
+            # Migration 7: store Python-lowercased titles for duplicate checks.
+            # SQLite's lower() only folds ASCII, so "ÉMILE" and "émile" would differ.
+            cursor = conn.execute("PRAGMA table_info(requests)")
+            columns = [r[1] for r in cursor.fetchall()]
+            if "title_lower" not in columns:
+                logger.info("Migration 7: Adding title_lower column")
+                conn.execute("ALTER TABLE requests ADD COLUMN title_lower TEXT")
+            rows = conn.execute("SELECT id, title FROM requests WHERE title_lower IS NULL").fetchall()
+            conn.executemany(
+                "UPDATE requests SET title_lower = ? WHERE id = ?",
+                [(r["title"].lower(), r["id"]) for r in rows],
+            )
+            # Replaced by an index on title_lower in _CREATE_REQUESTS_INDEXES_SQL
+            conn.execute("DROP INDEX IF EXISTS idx_requests_active_title")
+            conn.execute("UPDATE schema_version SET version = 7")
+
+    def _rebuild_requests_table(
+        self, conn: sqlite3.Connection, create_new_sql: str, columns: str
+    ) -> None:
+        """Recreate the requests table from requests_new in a single transaction.
+
+        Joins the caller's transaction if one is open (initialize() runs all
+        migrations in one), otherwise opens its own. Deferring foreign keys
+        checks them once at COMMIT instead of per copied row, and the whole
+        copy/drop/rename costs a single sync.
+        """
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("PRAGMA defer_foreign_keys=ON")
+            conn.execute(create_new_sql)
+            conn.execute(f"INSERT INTO requests_new SELECT {columns} FROM requests")
+            conn.execute("DROP TABLE requests")
+            conn.execute("ALTER TABLE requests_new RENAME TO requests")
+            if owns_transaction:
+                conn.execute("COMMIT")
+        except Exception:
+            if owns_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
     def create_request(
         self,
         user_id: int,
@@ -258,35 +586,61 @@ class RequestDB:
         """Create a new request. Returns the created request dict."""
         if content_type not in _VALID_CONTENT_TYPES:
             raise ValueError(f"Invalid content_type: {content_type}")
-        with self._lock:
-            conn = self._connect()
-            try:
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
                 safe_cover_url = _sanitize_url(cover_url)
                 cursor = conn.execute(
                     """INSERT INTO requests
                        (user_id, title, content_type, author, year, cover_url, description,
                         isbn_10, isbn_13, provider, provider_id, series_name, series_position,
-                        prefer_alternate_version, is_manual_request, is_released)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        prefer_alternate_version, is_manual_request, is_released, title_lower)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       RETURNING *""",
                     (user_id, title, content_type, author, year, safe_cover_url, description,
                      isbn_10, isbn_13, provider, provider_id, series_name, series_position,
                      1 if prefer_alternate_version else 0,
                      1 if is_manual_request else 0,
-                     None if is_released is None else (1 if is_released else 0)),
+                     None if is_released is None else (1 if is_released else 0),
+                     title.lower()),
                 )
-                conn.commit()
-                request_id = cursor.lastrowid
-                return self._get_request(conn, request_id)
-            finally:
-                conn.close()
-
-    def get_request(self, request_id: int) -> Optional[Dict[str, Any]]:
-        """Get a single request by ID with requester info."""
-        conn = self._connect()
-        try:
+                return self._with_user_names(conn, cursor.fetchone())
+
+    def create_requests_bulk(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Create many requests in one transaction. Returns new IDs in input order.
+
+        Each row takes the same keys as create_request's arguments; user_id
+        and title are required. Nothing is inserted if any row is invalid.
+        """
+        params = [_bulk_insert_params(row) for row in rows]
+        ids: List[int] = []
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for start in range(0, len(params), _BULK_INSERT_CHUNK):
+                    chunk = params[start:start + _BULK_INSERT_CHUNK]
+                    flat = [value for row_params in chunk for value in row_params]
+                    returned = conn.execute(_bulk_insert_sql(len(chunk)), flat).fetchall()
+                    # RETURNING order is unspecified; AUTOINCREMENT ids follow row order.
+                    ids.extend(sorted(r["id"] for r in returned))
+        return ids
+
+    def get_request(
+        self, request_id: int, include_users: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single request by ID with requester info.
+
+        Pass include_users=False for status/ownership checks that don't need
+        the requester_* / handled_by_* name columns; that skips the users JOIN.
+        """
+        with self._connection() as conn:
+            if not include_users:
+                return self._get_request_raw(conn, request_id)
             return self._get_request(conn, request_id)
-        finally:
-            conn.close()
+
+    def _get_request_raw(self, conn: sqlite3.Connection, request_id: int) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT * FROM requests WHERE id = ?", (request_id,)).fetchone()
+        return dict(row) if row else None
 
     def _get_request(self, conn: sqlite3.Connection, request_id: int) -> Optional[Dict[str, Any]]:
         row = conn.execute(
@@ -300,6 +654,23 @@ class RequestDB:
         ).fetchone()
         return dict(row) if row else None
 
+    def _with_user_names(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, Any]:
+        """Build the _get_request shape from a RETURNING row plus one users lookup."""
+        request = dict(row)
+        names = conn.execute(
+            _USER_NAMES_SQL, (request["approved_by"], request["user_id"])
+        ).fetchone()
+        if names:
+            request.update(names)
+        else:
+            request.update(
+                requester_username=None,
+                requester_display_name=None,
+                handled_by_username=None,
+                handled_by_display_name=None,
+            )
+        return request
+
     def list_requests(
         self,
         user_id: Optional[int] = None,
@@ -307,8 +678,8 @@ class RequestDB:
         limit: int = 100,
         offset: int = 0,
         include_hidden_from_admin: bool = False,
-    ) -> List[Dict[str, Any]]:
-        """List requests with optional filters. Returns list of request dicts.
+    ) -> List[RequestRow]:
+        """List requests with optional filters. Returns list of request rows.
 
         Args:
             user_id: Filter by specific user (None = all users for admin view)
@@ -318,36 +689,47 @@ class RequestDB:
             include_hidden_from_admin: If False and user_id is None (admin view),
                                       exclude requests hidden from admin
         """
-        conn = self._connect()
-        try:
-            conditions = []
-            params: list = []
-            if user_id is not None:
-                conditions.append("r.user_id = ?")
-                params.append(user_id)
-            else:
-                # Admin view - exclude hidden requests unless explicitly requested
-                if not include_hidden_from_admin:
-                    conditions.append("(r.hidden_from_admin = 0 OR r.hidden_from_admin IS NULL)")
-            if status is not None:
-                conditions.append("r.status = ?")
-                params.append(status)
-            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-            params.extend([limit, offset])
-            rows = conn.execute(
-                f"""SELECT r.*, u.username AS requester_username, u.display_name AS requester_display_name,
-                           a.username AS handled_by_username, a.display_name AS handled_by_display_name
-                    FROM requests r
-                    JOIN users u ON r.user_id = u.id
-                    LEFT JOIN users a ON r.approved_by = a.id
-                    {where}
-                    ORDER BY r.created_at DESC
-                    LIMIT ? OFFSET ?""",
-                params,
-            ).fetchall()
-            return [dict(r) for r in rows]
-        finally:
-            conn.close()
+        has_user = user_id is not None
+        has_status = status is not None
+        # Admin view - exclude hidden requests unless explicitly requested
+        exclude_hidden = not has_user and not include_hidden_from_admin
+        params: list = []
+        if has_user:
+            params.append(user_id)
+        if has_status:
+            params.append(status)
+        params.extend([limit, offset])
+        with self._connection() as conn:
+            return conn.execute(_LIST_SQL[(has_user, has_status, exclude_hidden)], params).fetchall()
+
+    def list_requests_keyset(
+        self,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[Tuple[str, int]] = None,
+        include_hidden_from_admin: bool = False,
+    ) -> List[RequestRow]:
+        """List requests newest first, continuing after a ``(created_at, id)`` cursor.
+
+        Seeks straight to the cursor instead of skipping ``offset`` rows, so
+        later pages cost the same as the first. Pass the last row's
+        ``(created_at, id)`` from the previous page as ``after``.
+        """
+        has_user = user_id is not None
+        has_status = status is not None
+        exclude_hidden = not has_user and not include_hidden_from_admin
+        params: list = []
+        if has_user:
+            params.append(user_id)
+        if has_status:
+            params.append(status)
+        if after is not None:
+            params.extend(after)
+        params.append(limit)
+        sql = _LIST_KEYSET_SQL[(has_user, has_status, exclude_hidden, after is not None)]
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchall()
 
     def count_requests(
         self,
@@ -355,74 +737,59 @@ class RequestDB:
         status: Optional[str] = None,
     ) -> int:
         """Count requests with optional filters."""
-        conn = self._connect()
-        try:
-            conditions = []
-            params: list = []
-            if user_id is not None:
-                conditions.append("user_id = ?")
-                params.append(user_id)
-            if status is not None:
-                conditions.append("status = ?")
-                params.append(status)
-            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params = [value for value in (user_id, status) if value is not None]
+        with self._connection() as conn:
             row = conn.execute(
-                f"SELECT COUNT(*) AS cnt FROM requests {where}", params
+                _COUNT_SQL[(user_id is not None, status is not None)], params
             ).fetchone()
             return row["cnt"] if row else 0
-        finally:
-            conn.close()
 
     def get_request_counts(self, user_id: Optional[int] = None) -> Dict[str, int]:
         """Get counts per status. Admins see all (user_id=None), users see own."""
-        conn = self._connect()
-        try:
+        with self._connection() as conn:
             if user_id is not None:
-                rows = conn.execute(
-                    "SELECT status, COUNT(*) AS cnt FROM requests WHERE user_id = ? GROUP BY status",
-                    (user_id,),
-                ).fetchall()
+                row = conn.execute(_STATUS_COUNTS_SQL + " WHERE user_id = ?", (user_id,)).fetchone()
             else:
-                rows = conn.execute(
-                    "SELECT status, COUNT(*) AS cnt FROM requests GROUP BY status"
-                ).fetchall()
-            counts: Dict[str, int] = {s: 0 for s in _VALID_STATUSES}
-            total = 0
-            for r in rows:
-                counts[r["status"]] = r["cnt"]
-                total += r["cnt"]
-            counts["total"] = total
-            return counts
-        finally:
-            conn.close()
+                row = conn.execute(_STATUS_COUNTS_SQL).fetchone()
+            return dict(row)
 
     def get_unviewed_count(self, user_id: int) -> int:
         """Get count of requests with status updates since user last viewed."""
-        conn = self._connect()
-        try:
-            # Get user's last viewed timestamp from users table
-            user_row = conn.execute(
-                "SELECT requests_last_viewed_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
+        with self._connection() as conn:
+            # A missing/NULL last-viewed timestamp falls back to '', which every
+            # stored updated_at sorts after, so all of the user's requests count.
+            return conn.execute(
+                """SELECT COUNT(*) FROM requests
+                   WHERE user_id = ?
+                     AND updated_at > COALESCE(
+                         (SELECT requests_last_viewed_at FROM users WHERE id = ?), ''
+                     )""",
+                (user_id, user_id),
+            ).fetchone()[0]
+
+    def has_active_duplicate(
+        self,
+        user_id: int,
+        content_type: str,
+        provider: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        title: str = "",
+    ) -> bool:
+        """Check whether the user already has an active request for the same book.
 
-            if not user_row or not user_row["requests_last_viewed_at"]:
-                # User has never viewed requests, count all their requests
+        Matches on provider/provider_id when both are given, otherwise on
+        case-insensitive title.
+        """
+        with self._connection() as conn:
+            if provider and provider_id:
                 row = conn.execute(
-                    "SELECT COUNT(*) AS cnt FROM requests WHERE user_id = ?",
-                    (user_id,),
+                    _DUPLICATE_BY_PROVIDER_SQL, (user_id, provider, provider_id, content_type)
                 ).fetchone()
-                return row["cnt"] if row else 0
-
-            # Count requests updated after last viewed time
-            row = conn.execute(
-                """SELECT COUNT(*) AS cnt FROM requests
-                   WHERE user_id = ? AND updated_at > ?""",
-                (user_id, user_row["requests_last_viewed_at"]),
-            ).fetchone()
-            return row["cnt"] if row else 0
-        finally:
-            conn.close()
+            else:
+                row = conn.execute(
+                    _DUPLICATE_BY_TITLE_SQL, (user_id, title.lower(), content_type)
+                ).fetchone()
+            return row is not None
 
     def update_request_status(
         self,
@@ -435,28 +802,16 @@ class RequestDB:
         """Update request status and optional fields. Returns updated request or None."""
         if status not in _VALID_STATUSES:
             raise ValueError(f"Invalid status: {status}")
-        with self._lock:
-            conn = self._connect()
-            try:
-                sets = ["status = ?", "updated_at = CURRENT_TIMESTAMP"]
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                optional = (admin_note, approved_by, download_task_id)
+                sql = _UPDATE_STATUS_SQL[tuple(value is not None for value in optional)]
                 params: list = [status]
-                if admin_note is not None:
-                    sets.append("admin_note = ?")
-                    params.append(admin_note)
-                if approved_by is not None:
-                    sets.append("approved_by = ?")
-                    params.append(approved_by)
-                if download_task_id is not None:
-                    sets.append("download_task_id = ?")
-                    params.append(download_task_id)
+                params.extend(value for value in optional if value is not None)
                 params.append(request_id)
-                conn.execute(
-                    f"UPDATE requests SET {', '.join(sets)} WHERE id = ?", params
-                )
-                conn.commit()
-                return self._get_request(conn, request_id)
-            finally:
-                conn.close()
+                row = conn.execute(sql, params).fetchone()
+                return self._with_user_names(conn, row) if row else None
 
     def update_request_metadata(
         self,
@@ -468,79 +823,54 @@ class RequestDB:
         clear_expected_release_date: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Update request metadata (provider, provider_id, expected_release_date). Returns updated request or None."""
-        with self._lock:
-            conn = self._connect()
-            try:
-                sets = ["updated_at = CURRENT_TIMESTAMP"]
-                params: list = []
-                if provider is not None:
-                    sets.append("provider = ?")
-                    params.append(provider)
-                if provider_id is not None:
-                    sets.append("provider_id = ?")
-                    params.append(provider_id)
-                if expected_release_date is not None or clear_expected_release_date:
-                    sets.append("expected_release_date = ?")
-                    params.append(expected_release_date)
-                if is_released is not None:
-                    sets.append("is_released = ?")
-                    params.append(1 if is_released else 0)
-                params.append(request_id)
-                conn.execute(
-                    f"UPDATE requests SET {', '.join(sets)} WHERE id = ?", params
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                flags = (
+                    provider is not None,
+                    provider_id is not None,
+                    expected_release_date is not None or clear_expected_release_date,
+                    is_released is not None,
                 )
-                conn.commit()
-                return self._get_request(conn, request_id)
-            finally:
-                conn.close()
+                values = (
+                    provider,
+                    provider_id,
+                    expected_release_date,
+                    None if is_released is None else (1 if is_released else 0),
+                )
+                params: list = [value for value, enabled in zip(values, flags) if enabled]
+                params.append(request_id)
+                row = conn.execute(_UPDATE_METADATA_SQL[flags], params).fetchone()
+                return self._with_user_names(conn, row) if row else None
 
     def delete_request(self, request_id: int) -> bool:
         """Delete a request. Returns True if a row was deleted."""
-        with self._lock:
-            conn = self._connect()
-            try:
-                cursor = conn.execute("DELETE FROM requests WHERE id = ?", (request_id,))
-                conn.commit()
-                return cursor.rowcount > 0
-            finally:
-                conn.close()
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM requests WHERE id = ?", (request_id,))
+            return cursor.rowcount > 0
 
     def hide_request_from_admin(self, request_id: int) -> bool:
         """Hide a request from admin view. Returns True if updated."""
-        with self._lock:
-            conn = self._connect()
-            try:
-                cursor = conn.execute(
-                    "UPDATE requests SET hidden_from_admin = 1 WHERE id = ?",
-                    (request_id,)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-            finally:
-                conn.close()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE requests SET hidden_from_admin = 1 WHERE id = ?",
+                (request_id,)
+            )
+            return cursor.rowcount > 0
 
     def delete_requests_by_user(self, user_id: int) -> int:
         """Delete all requests for a given user. Returns number of deleted requests."""
-        with self._lock:
-            conn = self._connect()
-            try:
-                cursor = conn.execute("DELETE FROM requests WHERE user_id = ?", (user_id,))
-                conn.commit()
-                return cursor.rowcount
-            finally:
-                conn.close()
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM requests WHERE user_id = ?", (user_id,))
+            return cursor.rowcount
 
-    def get_requests_by_download_task(self, task_id: str) -> List[Dict[str, Any]]:
+    def get_requests_by_download_task(self, task_id: str) -> List[RequestRow]:
         """Get all requests linked to a download task ID."""
-        conn = self._connect()
-        try:
-            rows = conn.execute(
+        with self._connection() as conn:
+            return conn.execute(
                 """SELECT r.*, u.username AS requester_username, u.display_name AS requester_display_name
                    FROM requests r
                    JOIN users u ON r.user_id = u.id
                    WHERE r.download_task_id = ?""",
                 (task_id,),
             ).fetchall()
-            return [dict(r) for r in rows]
-        finally:
-            conn.close()
@@ -5,14 +5,105 @@ fulfilled, or failed. Reuses the existing SMTP configuration from
 the email output settings.
 """
 
+import atexit
+import smtplib
+import threading
+import time
 from email.message import EmailMessage
-from email.utils import formatdate, make_msgid, parseaddr
-from typing import Optional
+from email.utils import formatdate, make_msgid
+from typing import Any, Optional
 
 from shelfmark.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Reconnect after this many messages so long-lived sessions don't trip
+# provider per-connection limits, and drop connections idle for longer than
+# servers typically keep them open.
+_SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+_SMTP_IDLE_TIMEOUT_SECONDS = 60.0
+
+
+class _SMTPPool:
+    """Keeps one authenticated SMTP connection open between notifications.
+
+    Sends are serialized under a lock, so a single connection covers the
+    burst case (bulk approve/deny) without paying TCP + TLS + AUTH for every
+    message.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._config: Any = None
+        self._sent = 0
+        self._last_used = 0.0
+
+    def send(self, smtp_config: Any, message: EmailMessage) -> None:
+        """Send ``message``, reusing the open connection when it is still healthy."""
+        from shelfmark.download.outputs.email import EmailOutputError
+
+        with self._lock:
+            try:
+                try:
+                    smtp = self._checkout(smtp_config)
+                    smtp.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    # Server dropped a reused connection between the health check and the send.
+                    self._close()
+                    smtp = self._checkout(smtp_config)
+                    smtp.send_message(message)
+            except smtplib.SMTPAuthenticationError as exc:
+                self._close()
+                raise EmailOutputError("SMTP authentication failed") from exc
+            except (smtplib.SMTPException, TimeoutError, OSError) as exc:
+                self._close()
+                raise EmailOutputError(f"Failed to send email: {exc}") from exc
+
+            self._sent += 1
+            self._last_used = time.monotonic()
+            if self._sent >= _SMTP_MAX_MESSAGES_PER_CONNECTION:
+                self._close()
+
+    def close_all(self) -> None:
+        """QUIT the open connection, if any."""
+        with self._lock:
+            self._close()
+
+    def _checkout(self, smtp_config: Any) -> smtplib.SMTP:
+        from shelfmark.download.outputs.email import open_smtp_connection
+
+        if self._smtp is not None:
+            idle = time.monotonic() - self._last_used
+            if smtp_config != self._config or idle > _SMTP_IDLE_TIMEOUT_SECONDS:
+                self._close()
+            else:
+                try:
+                    # RSET clears any half-finished transaction and doubles as a liveness check.
+                    if self._smtp.rset()[0] != 250:
+                        self._close()
+                except (smtplib.SMTPException, OSError):
+                    self._close()
+
+        if self._smtp is None:
+            self._smtp = open_smtp_connection(smtp_config)
+            self._config = smtp_config
+            self._sent = 0
+        return self._smtp
+
+    def _close(self) -> None:
+        from shelfmark.download.outputs.email import close_smtp_connection
+
+        if self._smtp is not None:
+            close_smtp_connection(self._smtp)
+        self._smtp = None
+        self._config = None
+        self._sent = 0
+
+
+_smtp_pool = _SMTPPool()
+atexit.register(_smtp_pool.close_all)
+
 
 STATUS_MESSAGES = {
     "approved": "Your book request has been approved and is being processed.",
@@ -32,12 +123,22 @@ def _is_notification_enabled() -> bool:
         return False
 
 
+# (config generation, SMTP config) — rebuilt only after the config is refreshed
+_smtp_config_cache: Optional[tuple[int, Any]] = None
+
+
 def _get_smtp_config():
     """Build SMTP config from existing email settings, or None if not configured."""
+    global _smtp_config_cache
     try:
         import shelfmark.core.config as core_config
         from shelfmark.download.outputs.email import build_email_smtp_config
 
+        generation = core_config.config.generation
+        cached = _smtp_config_cache
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
         settings = {
             "EMAIL_SMTP_HOST": core_config.config.get("EMAIL_SMTP_HOST", ""),
             "EMAIL_SMTP_PORT": core_config.config.get("EMAIL_SMTP_PORT", 587),
@@ -48,29 +149,34 @@ def _get_smtp_config():
             "EMAIL_SMTP_TIMEOUT_SECONDS": core_config.config.get("EMAIL_SMTP_TIMEOUT_SECONDS", 60),
             "EMAIL_ALLOW_UNVERIFIED_TLS": core_config.config.get("EMAIL_ALLOW_UNVERIFIED_TLS", False),
         }
-        return build_email_smtp_config(settings)
+        smtp_config = build_email_smtp_config(settings)
+        _smtp_config_cache = (generation, smtp_config)
+        return smtp_config
     except Exception as e:
         logger.debug(f"SMTP config not available for notifications: {e}")
         return None
 
 
-def send_request_notification(
-    user_email: str,
-    request_title: str,
-    new_status: str,
-    admin_note: Optional[str] = None,
-) -> bool:
-    """Send an email notification about a request status change.
+# Body text per status, formatted with the request title and status label
+_BODY_TEMPLATES = {
+    status: f"Book: {{title}}\nStatus: {{label}}\n\n{message}"
+    for status, message in STATUS_MESSAGES.items()
+}
+_DEFAULT_BODY_TEMPLATE = "Book: {title}\nStatus: {label}\n\nYour request status has changed to: {label}."
+_SIGNATURE = "\n\n— Shelfmark"
 
-    Args:
-        user_email: Recipient email address.
-        request_title: Title of the requested book.
-        new_status: New status (approved, denied, fulfilled, failed).
-        admin_note: Optional admin note to include.
 
-    Returns:
-        True if sent successfully, False otherwise.
-    """
+def _status_text(request_title: str, new_status: str, admin_note: Optional[str]) -> str:
+    """Body text describing one request's status change."""
+    template = _BODY_TEMPLATES.get(new_status, _DEFAULT_BODY_TEMPLATE)
+    text = template.format(title=request_title, label=new_status.capitalize())
+    if admin_note:
+        text += f"\n\nNote from admin: {admin_note}"
+    return text
+
+
+def _send_email(user_email: str, subject: str, body: str) -> bool:
+    """Build and send one notification email; returns False if disabled or on failure."""
     if not _is_notification_enabled():
         return False
 
@@ -82,24 +188,8 @@ def send_request_notification(
         logger.warning("Cannot send request notification: SMTP not configured")
         return False
 
-    status_label = new_status.capitalize()
-    status_message = STATUS_MESSAGES.get(new_status, f"Your request status has changed to: {status_label}.")
-
-    subject = f"Request {status_label}: {request_title}"
-    body_lines = [
-        f"Book: {request_title}",
-        f"Status: {status_label}",
-        "",
-        status_message,
-    ]
-
-    if admin_note:
-        body_lines.extend(["", f"Note from admin: {admin_note}"])
-
-    body_lines.extend(["", "— Shelfmark"])
-
     try:
-        from shelfmark.download.outputs.email import send_email_message
+        from shelfmark.download.outputs.email import msgid_domain
 
         msg = EmailMessage()
         msg["From"] = smtp_config.from_addr
@@ -107,20 +197,60 @@ def send_request_notification(
         msg["Subject"] = subject
         msg["Date"] = formatdate(localtime=True)
 
-        domain = "shelfmark.local"
-        try:
-            from_email = parseaddr(smtp_config.from_addr)[1]
-            domain = (from_email.partition("@")[2] or "").strip().rstrip(">") or domain
-        except Exception:
-            pass
-        msg["Message-ID"] = make_msgid(domain=domain)
+        msg["Message-ID"] = make_msgid(domain=msgid_domain(smtp_config.from_addr))
 
-        msg.set_content("\n".join(body_lines))
+        msg.set_content(body + _SIGNATURE)
 
-        send_email_message(smtp_config, msg)
+        _smtp_pool.send(smtp_config, msg)
         logger.info(f"Request notification sent to {user_email}: {subject}")
         return True
 
     except Exception as e:
         logger.warning(f"Failed to send request notification to {user_email}: {e}")
         return False
+
+
+def send_request_notification(
+    user_email: str,
+    request_title: str,
+    new_status: str,
+    admin_note: Optional[str] = None,
+) -> bool:
+    """Send an email notification about a request status change.
+
+    Args:
+        user_email: Recipient email address.
+        request_title: Title of the requested book.
+        new_status: New status (approved, denied, fulfilled, failed).
+        admin_note: Optional admin note to include.
+
+    Returns:
+        True if sent successfully, False otherwise.
+    """
+    subject = f"Request {new_status.capitalize()}: {request_title}"
+    return _send_email(user_email, subject, _status_text(request_title, new_status, admin_note))
+
+
+def send_request_notifications(
+    user_email: str,
+    updates: list[tuple[str, str, Optional[str]]],
+) -> bool:
+    """Send one email covering several status changes for the same user.
+
+    Args:
+        user_email: Recipient email address.
+        updates: ``(request_title, new_status, admin_note)`` tuples in the order they happened.
+
+    Returns:
+        True if sent successfully, False otherwise.
+    """
+    if not updates:
+        return False
+    if len(updates) == 1:
+        return send_request_notification(user_email, *updates[0])
+
+    body = "\n\n---\n\n".join(
+        _status_text(request_title, new_status, admin_note)
+        for request_title, new_status, admin_note in updates
+    )
+    return _send_email(user_email, f"{len(updates)} request updates", body)
@@ -4,19 +4,57 @@ Registers /api/requests endpoints for the book request workflow.
 Authenticated users can create requests; admins can approve/deny them.
 """
 
+import atexit
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import date, datetime
 import threading
-from functools import wraps
+from functools import cache, wraps
+from types import SimpleNamespace
+from typing import NamedTuple
 
-from flask import Flask, jsonify, request, session
+from flask import Flask, g, jsonify, request, session
 
+from shelfmark.core import settings_registry
 from shelfmark.core.audiobookshelf import abs_client
+from shelfmark.core.config import config
+from shelfmark.core.discord_notifications import (
+    new_request_notifications_enabled,
+    queue_discord_book_available,
+    queue_discord_new_request,
+)
 from shelfmark.core.logger import setup_logger
+from shelfmark.core.notification_queue import enqueue_batched, enqueue_notification
+from shelfmark.core.pushover_notifications import send_new_request_pushover
 from shelfmark.core.request_db import RequestDB
+from shelfmark.core.request_notifications import send_request_notifications
 from shelfmark.core.user_db import UserDB
 
+try:
+    from shelfmark.api.websocket import ws_manager
+except ImportError:  # flask_socketio not installed
+    ws_manager = None
+
 logger = setup_logger(__name__)
 
+# Statuses an admin may set through PUT /status (listed in this order in errors)
+_VALID_STATUSES_ORDER = (
+    "pending",
+    "prerelease_requested",
+    "approved",
+    "denied",
+    "downloading",
+    "fulfilled",
+    "failed",
+    "cancelled",
+)
+_VALID_STATUSES = frozenset(_VALID_STATUSES_ORDER)
+_VALID_STATUSES_TEXT = ", ".join(_VALID_STATUSES_ORDER)
+# Manual status changes that email the requester
+_NOTIFY_STATUSES = frozenset(("approved", "denied", "fulfilled", "failed"))
+_RETRYABLE_STATUSES = frozenset(("failed", "cancelled", "denied", "downloading", "approved"))
+
 
 def _normalize_release_date(raw_value: object) -> str | None:
     """Normalize user/provider release dates to YYYY-MM-DD when possible."""
@@ -57,23 +95,72 @@ def _is_future_release_date(expected_release_date: str | None) -> bool:
         return False
 
 
+# AUTH_METHOD keyed on the security config file's mtime, so the YAML is
+# re-parsed only after a save instead of on every guarded request
+_AUTH_MODE_CACHE: dict = {"value": None, "mtime": None}
+_auth_mode_lock = threading.Lock()
+
+
 def _get_auth_mode():
     """Get current auth mode from config."""
     try:
-        from shelfmark.core.settings_registry import load_config_file
-        config = load_config_file("security")
-        return config.get("AUTH_METHOD", "none")
+        try:
+            mtime = settings_registry._get_config_file_path("security").stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with _auth_mode_lock:
+            if _AUTH_MODE_CACHE["value"] is not None and _AUTH_MODE_CACHE["mtime"] == mtime:
+                return _AUTH_MODE_CACHE["value"]
+            auth_mode = settings_registry.load_config_file("security").get("AUTH_METHOD", "none")
+            _AUTH_MODE_CACHE.update(value=auth_mode, mtime=mtime)
+            return auth_mode
     except Exception:
         return "none"
 
 
+def _decode_list_cursor(cursor: str) -> tuple[str, int] | None:
+    """Parse a list cursor (``"<created_at>|<id>"``); None if malformed."""
+    created_at, sep, request_id = cursor.rpartition("|")
+    if not sep or not created_at:
+        return None
+    try:
+        return created_at, int(request_id)
+    except ValueError:
+        return None
+
+
+class _SessionCtx(NamedTuple):
+    auth_mode: str
+    authenticated: bool
+    username: str | None
+    db_user_id: int | None
+    is_admin: bool
+
+
+def _session_ctx() -> _SessionCtx:
+    """Auth mode and session identity, resolved once per request and kept on flask.g."""
+    ctx = g.get("_session_ctx")
+    if ctx is None:
+        # Resolve the session proxy once instead of on every lookup
+        sess = session._get_current_object()
+        auth_mode = _get_auth_mode()
+        ctx = g._session_ctx = _SessionCtx(
+            auth_mode=auth_mode,
+            authenticated="user_id" in sess,
+            username=sess.get("user_id"),
+            db_user_id=sess.get("db_user_id"),
+            is_admin=auth_mode == "none" or bool(sess.get("is_admin", False)),
+        )
+    return ctx
+
+
 def _require_auth(f):
     """Decorator requiring an authenticated session."""
     @wraps(f)
     def decorated(*args, **kwargs):
-        auth_mode = _get_auth_mode()
-        if auth_mode != "none":
-            if "user_id" not in session:
+        ctx = _session_ctx()
+        if ctx.auth_mode != "none":
+            if not ctx.authenticated:
                 return jsonify({"error": "Authentication required"}), 401
         return f(*args, **kwargs)
     return decorated
@@ -83,11 +170,11 @@ def _require_admin(f):
     """Decorator requiring admin session."""
     @wraps(f)
     def decorated(*args, **kwargs):
-        auth_mode = _get_auth_mode()
-        if auth_mode != "none":
-            if "user_id" not in session:
+        ctx = _session_ctx()
+        if ctx.auth_mode != "none":
+            if not ctx.authenticated:
                 return jsonify({"error": "Authentication required"}), 401
-            if not session.get("is_admin", False):
+            if not ctx.is_admin:
                 return jsonify({"error": "Admin access required"}), 403
         return f(*args, **kwargs)
     return decorated
@@ -95,31 +182,76 @@ def _require_admin(f):
 
 def _get_db_user_id() -> int | None:
     """Get the database user ID from session."""
-    return session.get("db_user_id")
+    return _session_ctx().db_user_id
 
 
 def _is_admin() -> bool:
     """Check if current user is admin."""
-    auth_mode = _get_auth_mode()
-    if auth_mode == "none":
-        return True
-    return session.get("is_admin", False)
+    return _session_ctx().is_admin
 
 
-def _broadcast_request_update(request_data: dict | None = None) -> None:
-    """Broadcast a request_update event via WebSocket."""
+def _emit_request_event(event: str, payload: dict) -> None:
     try:
-        from shelfmark.api.websocket import ws_manager
         if ws_manager and ws_manager.is_enabled():
-            ws_manager.socketio.emit("request_update", request_data or {})
+            ws_manager.socketio.emit(event, payload)
     except Exception as e:
         logger.warning(f"Failed to broadcast request update: {e}")
 
 
+# Updates arriving within this window after an emit are sent together
+_BROADCAST_COALESCE_SECONDS = 0.05
+
+
+class _BroadcastCoalescer:
+    """Collapses bursts of request updates into one websocket event.
+
+    The first update after a quiet period is emitted straight away as
+    ``request_update``. Updates arriving within the window are held (last
+    write wins per request id) and sent as a single ``request_updates``
+    event when it closes.
+    """
+
+    def __init__(self, window: float) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending: dict = {}
+        self._timer: threading.Timer | None = None
+
+    def add(self, request_data: dict) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._pending[request_data.get("id", id(request_data))] = request_data
+                return
+            self._timer = threading.Timer(self._window, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+        _emit_request_event("request_update", request_data)
+
+    def _flush(self) -> None:
+        with self._lock:
+            updates = list(self._pending.values())
+            self._pending.clear()
+            self._timer = None
+        if updates:
+            _emit_request_event("request_updates", {"updates": updates})
+
+
+_broadcast_coalescer = _BroadcastCoalescer(_BROADCAST_COALESCE_SECONDS)
+
+
+def _broadcast_request_update(request_data: dict | None = None) -> None:
+    """Broadcast a request update via WebSocket, coalescing bursts."""
+    _broadcast_coalescer.add(request_data or {})
+
+
 def _send_pushover_new_request(req: dict, user_db: UserDB) -> None:
+    """Queue a Pushover notification to admin for a new request (best-effort, non-blocking)."""
+    enqueue_notification("Pushover new-request", _deliver_pushover_new_request, req, user_db)
+
+
+def _deliver_pushover_new_request(req: dict, user_db: UserDB) -> None:
     """Send Pushover notification to admin when a new request is created (best-effort)."""
     try:
-        from shelfmark.core.pushover_notifications import send_new_request_pushover
         user_id = req.get("user_id")
         requester = None
         if user_id:
@@ -137,9 +269,11 @@ def _send_pushover_new_request(req: dict, user_db: UserDB) -> None:
 
 
 def _send_discord_new_request(req: dict, user_db: UserDB) -> None:
-    """Send Discord embed notification on new request (best-effort)."""
+    """Queue a Discord embed for a new request; queued embeds are batched per webhook call."""
     try:
-        from shelfmark.core.discord_notifications import send_discord_new_request
+        # Skip the requester lookup entirely when Discord wouldn't send anything
+        if not new_request_notifications_enabled():
+            return
         requester = req.get("requester_username")
         if not requester:
             user_id = req.get("user_id")
@@ -147,7 +281,7 @@ def _send_discord_new_request(req: dict, user_db: UserDB) -> None:
                 user = user_db.get_user(user_id=user_id)
                 if user:
                     requester = user.get("username")
-        send_discord_new_request(
+        queue_discord_new_request(
             title=req.get("title", "Unknown"),
             author=req.get("author"),
             requester=requester,
@@ -160,10 +294,9 @@ def _send_discord_new_request(req: dict, user_db: UserDB) -> None:
 
 
 def _send_discord_book_available(req: dict) -> None:
-    """Send Discord embed notification when a book is fulfilled (best-effort)."""
+    """Queue a Discord embed for a fulfilled book; queued embeds are batched per webhook call."""
     try:
-        from shelfmark.core.discord_notifications import send_discord_book_available
-        send_discord_book_available(
+        queue_discord_book_available(
             title=req.get("title", "Unknown"),
             author=req.get("author"),
             requester=req.get("requester_username"),
@@ -176,23 +309,36 @@ def _send_discord_book_available(req: dict) -> None:
 def _send_status_notification(
     user_db: UserDB, req: dict, new_status: str, admin_note: str | None = None
 ) -> None:
-    """Send email notification to the requesting user (best-effort, non-blocking)."""
-    try:
+    """Queue an email to the requesting user (best-effort, non-blocking).
+
+    Updates queued close together are coalesced into one email per user.
+    """
+    enqueue_batched(
+        "Request email",
+        _deliver_status_notifications,
+        (user_db, dict(req), new_status, admin_note),
+    )
+
+
+def _deliver_status_notifications(items: list[tuple[UserDB, dict, str, str | None]]) -> None:
+    """Send queued status emails, one per requesting user."""
+    by_user: dict[int, tuple[UserDB, list[tuple[str, str, str | None]]]] = {}
+    for user_db, req, new_status, admin_note in items:
         user_id = req.get("user_id")
         if not user_id:
-            return
-        user = user_db.get_user(user_id=user_id)
-        if not user or not user.get("email"):
-            return
-        from shelfmark.core.request_notifications import send_request_notification
-        send_request_notification(
-            user_email=user["email"],
-            request_title=req.get("title", "Unknown"),
-            new_status=new_status,
-            admin_note=admin_note,
+            continue
+        by_user.setdefault(user_id, (user_db, []))[1].append(
+            (req.get("title", "Unknown"), new_status, admin_note)
         )
-    except Exception as e:
-        logger.warning(f"Failed to send notification for request #{req.get('id')}: {e}")
+
+    for user_id, (user_db, updates) in by_user.items():
+        try:
+            user = user_db.get_user(user_id=user_id)
+            if not user or not user.get("email"):
+                continue
+            send_request_notifications(user["email"], updates)
+        except Exception as e:
+            logger.warning(f"Failed to send request notification for user {user_id}: {e}")
 
 
 def _requests_enabled() -> bool:
@@ -200,22 +346,26 @@ def _requests_enabled() -> bool:
     return _get_auth_mode() != "none"
 
 
-# Module-level guard against concurrent auto-downloads for the same request
-_in_flight_downloads: set = set()
-_in_flight_lock = threading.Lock()
+# Bounded pool for auto-downloads so a bulk approve doesn't start one thread per request
+_download_executor = ThreadPoolExecutor(
+    max_workers=max(1, int(os.environ.get("SHELFMARK_DOWNLOAD_WORKERS", "4"))),
+    thread_name_prefix="reqdl",
+)
+atexit.register(_download_executor.shutdown, wait=False, cancel_futures=True)
+
+# Module-level guard against concurrent auto-downloads for the same request.
+# dict.setdefault/pop are single atomic operations, so no lock is needed.
+_in_flight_downloads: dict[int, object] = {}
 
 
 def _acquire_download_slot(request_id: int) -> bool:
-    with _in_flight_lock:
-        if request_id in _in_flight_downloads:
-            return False
-        _in_flight_downloads.add(request_id)
-        return True
+    # A fresh token per call: only the caller whose token was stored wins the slot.
+    token = object()
+    return _in_flight_downloads.setdefault(request_id, token) is token
 
 
 def _release_download_slot(request_id: int) -> None:
-    with _in_flight_lock:
-        _in_flight_downloads.discard(request_id)
+    _in_flight_downloads.pop(request_id, None)
 
 
 def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB) -> None:
@@ -273,16 +423,14 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
         # Duplicate detection: check for active requests by the same user
         provider = data.get("provider")
         provider_id_val = data.get("provider_id")
-        existing = request_db.list_requests(user_id=db_user_id, limit=200)
-        active_statuses = {"pending", "approved", "downloading", "prerelease_requested"}
-        for ex in existing:
-            if ex["status"] not in active_statuses:
-                continue
-            if provider and provider_id_val:
-                if ex.get("provider") == provider and ex.get("provider_id") == provider_id_val and ex.get("content_type") == content_type:
-                    return jsonify({"error": "You already have an active request for this book"}), 409
-            elif ex.get("title", "").lower() == title.lower() and ex.get("content_type") == content_type:
-                return jsonify({"error": "You already have an active request for this book"}), 409
+        if request_db.has_active_duplicate(
+            db_user_id,
+            content_type,
+            provider=provider,
+            provider_id=provider_id_val,
+            title=title,
+        ):
+            return jsonify({"error": "You already have an active request for this book"}), 409
 
         try:
             req = request_db.create_request(
@@ -338,20 +486,38 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
             offset = max(0, int(request.args.get("offset", 0)))
         except ValueError:
             offset = 0
+        cursor = request.args.get("cursor")
+        include_total = request.args.get("include_total", "").lower() in ("1", "true")
 
         user_id = None if _is_admin() else _get_db_user_id()
 
-        requests_list = request_db.list_requests(
-            user_id=user_id, status=status_filter, limit=limit, offset=offset
-        )
-        total = request_db.count_requests(user_id=user_id, status=status_filter)
+        if cursor:
+            after = _decode_list_cursor(cursor)
+            if after is None:
+                return jsonify({"error": "Invalid cursor"}), 400
+            requests_list = request_db.list_requests_keyset(
+                user_id=user_id, status=status_filter, limit=limit, after=after
+            )
+        else:
+            # Offset paging is kept for older clients; cursors avoid skipping rows.
+            requests_list = request_db.list_requests(
+                user_id=user_id, status=status_filter, limit=limit, offset=offset
+            )
+
+        next_cursor = None
+        if requests_list and len(requests_list) == limit:
+            last = requests_list[-1]
+            next_cursor = f"{last['created_at']}|{last['id']}"
 
-        return jsonify({
-            "requests": requests_list,
-            "total": total,
+        response = {
+            "requests": [dict(r) for r in requests_list],
             "limit": limit,
             "offset": offset,
-        })
+            "next_cursor": next_cursor,
+        }
+        if include_total:
+            response["total"] = request_db.count_requests(user_id=user_id, status=status_filter)
+        return jsonify(response)
 
     @app.route("/api/requests/counts", methods=["GET"])
     @_require_auth
@@ -393,7 +559,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_auth
     def delete_request_route(request_id):
         """Delete/hide a request. Owners delete permanently; admins hide from their view."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
@@ -420,7 +586,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def approve_request_route(request_id):
         """Approve a request. Audiobooks stay at 'approved', ebooks trigger auto-download."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
@@ -433,6 +599,8 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
         updated = request_db.update_request_status(
             request_id, "approved", approved_by=admin_user_id
         )
+        if updated is None:
+            return jsonify({"error": "Request not found"}), 404
         logger.info(f"Request #{request_id} approved by admin {admin_user_id}")
         _broadcast_request_update(updated)
 
@@ -445,17 +613,15 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
             logger.info(f"Request #{request_id} is audiobook - staying at 'approved' for manual management")
             return jsonify(updated)
 
-        # For ebooks, start auto-download in background thread
+        # For ebooks, start auto-download on the download pool
         # Capture session data before spawning thread (session unavailable outside request context)
-        admin_username = session.get("user_id")
+        admin_username = _session_ctx().username
 
         if _acquire_download_slot(request_id):
-            thread = threading.Thread(
-                target=_auto_download_request,
-                args=(request_db, user_db, request_id, req, admin_user_id, admin_username),
-                daemon=True,
+            _download_executor.submit(
+                _auto_download_request,
+                request_db, user_db, request_id, req, admin_user_id, admin_username,
             )
-            thread.start()
         else:
             logger.info(f"Request #{request_id} already being auto-downloaded, skipping")
 
@@ -465,7 +631,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def deny_request_route(request_id):
         """Deny a request with optional admin note. Can be used on any status."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
@@ -478,6 +644,8 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
             request_id, "denied",
             admin_note=admin_note, approved_by=admin_user_id
         )
+        if updated is None:
+            return jsonify({"error": "Request not found"}), 404
         logger.info(f"Request #{request_id} denied by admin {admin_user_id} (was {req['status']})")
         _broadcast_request_update(updated)
 
@@ -490,7 +658,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def update_request_status_route(request_id):
         """Admin: manually update request status to any value."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
@@ -499,9 +667,8 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
         if not new_status:
             return jsonify({"error": "status is required"}), 400
 
-        valid_statuses = ["pending", "prerelease_requested", "approved", "denied", "downloading", "fulfilled", "failed", "cancelled"]
-        if new_status not in valid_statuses:
-            return jsonify({"error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"}), 400
+        if new_status not in _VALID_STATUSES:
+            return jsonify({"error": f"Invalid status. Must be one of: {_VALID_STATUSES_TEXT}"}), 400
         if new_status == "prerelease_requested":
             return jsonify({"error": "Use /move-to-prerelease with a future expected_release_date"}), 400
 
@@ -512,16 +679,16 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
             request_id, new_status,
             admin_note=admin_note, approved_by=admin_user_id
         )
+        if updated is None:
+            return jsonify({"error": "Request not found"}), 404
         logger.info(f"Request #{request_id} status changed to '{new_status}' by admin {admin_user_id} (was {req['status']})")
         _broadcast_request_update(updated)
 
         # Send notification to requester if status changed significantly
-        if new_status in ["approved", "denied", "fulfilled", "failed"]:
+        if new_status in _NOTIFY_STATUSES:
             _send_status_notification(user_db, req, new_status, admin_note=admin_note)
         if new_status == "fulfilled":
-            updated_req = request_db.get_request(request_id)
-            if updated_req:
-                _send_discord_book_available(updated_req)
+            _send_discord_book_available(updated)
 
         return jsonify(updated)
 
@@ -529,7 +696,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def activate_prerelease_request_route(request_id):
         """Activate a prerelease request immediately, moving it into the normal pending queue."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
         if req["status"] != "prerelease_requested":
@@ -553,7 +720,7 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def move_request_to_prerelease_route(request_id):
         """Move a request into prerelease hold until its release date arrives."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
         if req["status"] != "pending":
@@ -583,11 +750,11 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
     @_require_admin
     def retry_request_route(request_id):
         """Retry a failed, cancelled, denied, downloading, or approved request."""
-        req = request_db.get_request(request_id)
+        req = request_db.get_request(request_id, include_users=False)
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
-        if req["status"] not in ("failed", "cancelled", "denied", "downloading", "approved"):
+        if req["status"] not in _RETRYABLE_STATUSES:
             return jsonify({"error": f"Cannot retry a request with status '{req['status']}'"}), 400
 
         admin_user_id = _get_db_user_id()
@@ -596,16 +763,19 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
         updated = request_db.update_request_status(
             request_id, "approved", approved_by=admin_user_id
         )
+        if updated is None:
+            return jsonify({"error": "Request not found"}), 404
         logger.info(f"Request #{request_id} retrying by admin {admin_user_id}")
 
         # If request is missing metadata (from old direct-mode requests), search for it now
         if not updated.get("provider") or not updated.get("provider_id"):
             logger.info(f"Request #{request_id} missing metadata, searching...")
             try:
-                from shelfmark.metadata_providers import get_configured_provider, _get_configured_provider_name, MetadataSearchOptions
-
-                provider_name = _get_configured_provider_name() or "openlibrary"
-                provider = get_configured_provider(content_type=updated.get("content_type", "ebook"))
+                metadata_providers = _lazy_download_deps().metadata_providers
+                provider_name = metadata_providers._get_configured_provider_name() or "openlibrary"
+                provider = metadata_providers.get_configured_provider(
+                    content_type=updated.get("content_type", "ebook")
+                )
 
                 if provider:
                     title = updated.get("title", "")
@@ -615,7 +785,9 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
                     search_attempts = [f"{title} {author}".strip(), title] if author else [title]
                     results = []
                     for attempt in search_attempts:
-                        results = provider.search(MetadataSearchOptions(query=attempt))
+                        results = provider.search(
+                            metadata_providers.MetadataSearchOptions(query=attempt)
+                        )
                         if results:
                             break
 
@@ -623,14 +795,12 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
                         # Use the first result and update the request with metadata
                         best_match = results[0]
                         expected_release_date = best_match.publish_date if not updated.get("is_released") else None
-                        request_db.update_request_metadata(
+                        updated = request_db.update_request_metadata(
                             request_id,
                             provider=provider_name,
                             provider_id=best_match.provider_id,
                             expected_release_date=expected_release_date,
-                        )
-                        # Re-fetch the updated request
-                        updated = request_db.get_request(request_id)
+                        ) or updated
                         logger.info(f"Request #{request_id} metadata updated: {provider_name}:{best_match.provider_id}")
                     else:
                         logger.warning(f"Request #{request_id} metadata search returned no results for '{title}'")
@@ -645,23 +815,95 @@ def register_request_routes(app: Flask, request_db: RequestDB, user_db: UserDB)
             logger.info(f"Request #{request_id} is audiobook - staying at 'approved' for manual management")
             return jsonify(updated)
 
-        # For ebooks, start auto-download in background thread
+        # For ebooks, start auto-download on the download pool
         # Capture session data before spawning thread
-        admin_username = session.get("user_id")
+        admin_username = _session_ctx().username
 
         if _acquire_download_slot(request_id):
-            thread = threading.Thread(
-                target=_auto_download_request,
-                args=(request_db, user_db, request_id, updated, admin_user_id, admin_username),
-                daemon=True,
+            _download_executor.submit(
+                _auto_download_request,
+                request_db, user_db, request_id, updated, admin_user_id, admin_username,
             )
-            thread.start()
         else:
             logger.info(f"Request #{request_id} already being auto-downloaded, skipping")
 
         return jsonify(updated)
 
 
+@cache
+def _lazy_download_deps() -> SimpleNamespace:
+    """Import the metadata/release/download stack on first auto-download.
+
+    Kept out of module import so registering the routes doesn't load every
+    release source; the modules are returned (not their functions) so
+    lookups still go through the module attributes.
+    """
+    from shelfmark import metadata_providers, release_sources
+    from shelfmark.core import search_plan
+    from shelfmark.download import orchestrator
+
+    return SimpleNamespace(
+        metadata_providers=metadata_providers,
+        orchestrator=orchestrator,
+        release_sources=release_sources,
+        search_plan=search_plan,
+    )
+
+
+# (config generation, {provider name: instance or None}) — provider kwargs come
+# from settings, so instances are rebuilt only after the config is refreshed
+_provider_cache: tuple[int, dict] | None = None
+_provider_cache_lock = threading.Lock()
+
+
+def _get_request_provider(provider_name: str):
+    """Return a metadata provider for auto-download, or None if it isn't registered."""
+    global _provider_cache
+    providers_module = _lazy_download_deps().metadata_providers
+    generation = config.generation
+    with _provider_cache_lock:
+        cache = _provider_cache
+        if cache is None or cache[0] != generation:
+            cache = _provider_cache = (generation, {})
+        providers = cache[1]
+        if provider_name not in providers:
+            providers[provider_name] = (
+                providers_module.get_provider(
+                    provider_name, **providers_module.get_provider_kwargs(provider_name)
+                )
+                if providers_module.is_provider_registered(provider_name)
+                else None
+            )
+        return providers[provider_name]
+
+
+# (config generation, enabled source names) — availability is derived from
+# settings, so the list is rebuilt only after the config is refreshed
+_enabled_sources_cache: tuple[int, tuple[str, ...]] | None = None
+
+
+def _get_enabled_sources() -> tuple[str, ...]:
+    """Names of the release sources currently enabled, in priority order."""
+    global _enabled_sources_cache
+    generation = config.generation
+    cached = _enabled_sources_cache
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    sources = tuple(
+        src["name"]
+        for src in _lazy_download_deps().release_sources.list_available_sources()
+        if src["enabled"]
+    )
+    _enabled_sources_cache = (generation, sources)
+    return sources
+
+
+def _search_one(source_name: str, book, plan, content_type: str) -> list:
+    """Search a single release source for an auto-download."""
+    source = _lazy_download_deps().release_sources.get_source(source_name)
+    return source.search(book, plan, expand_search=True, content_type=content_type)
+
+
 def _auto_download_request(
     request_db: RequestDB,
     user_db: UserDB,
@@ -677,34 +919,25 @@ def _auto_download_request(
     """
     def _safe_update_status(status: str, **kwargs) -> None:
         """Update status only if the request still exists."""
-        if request_db.get_request(request_id) is not None:
-            request_db.update_request_status(request_id, status, **kwargs)
-            _broadcast_request_update(request_db.get_request(request_id))
-            if status == "fulfilled":
-                updated_req = request_db.get_request(request_id)
-                if updated_req:
-                    _send_discord_book_available(updated_req)
+        updated = request_db.update_request_status(request_id, status, **kwargs)
+        if updated is None:
+            return
+        _broadcast_request_update(updated)
+        if status == "fulfilled":
+            _send_discord_book_available(updated)
 
     try:
-        from shelfmark.download import orchestrator as backend
-        from shelfmark.release_sources import get_source, list_available_sources
-        from shelfmark.metadata_providers import (
-            get_provider,
-            is_provider_registered,
-            get_provider_kwargs,
-        )
-        from shelfmark.core.search_plan import build_release_search_plan
+        deps = _lazy_download_deps()
 
         provider_name = req.get("provider")
         provider_id = req.get("provider_id")
 
-        if not provider_name or not provider_id or not is_provider_registered(provider_name):
+        prov = _get_request_provider(provider_name) if provider_name and provider_id else None
+        if prov is None:
             _safe_update_status("failed", admin_note="Metadata lookup failed — could not identify book. Try searching manually and re-requesting.")
             return
 
         # Get book metadata from provider
-        kwargs = get_provider_kwargs(provider_name)
-        prov = get_provider(provider_name, **kwargs)
         book = prov.get_book(provider_id)
         if not book:
             _safe_update_status("failed", admin_note=f"Book not found in {provider_name} — metadata provider returned no data.")
@@ -712,35 +945,46 @@ def _auto_download_request(
 
         # Search for releases
         content_type = req.get("content_type", "ebook")
-        sources_to_search = [src["name"] for src in list_available_sources() if src["enabled"]]
+        sources_to_search = _get_enabled_sources()
         if not sources_to_search:
             _safe_update_status("failed", admin_note="No download sources are enabled. Check settings.")
             return
 
-        all_releases = []
+        # Sources are queried concurrently but consumed in priority order: as
+        # soon as the highest-priority source with results has answered, its
+        # first release is used and lower-priority searches are abandoned.
+        plan = deps.search_plan.build_release_search_plan(book)
+        release = None
         source_errors = []
-        for source_name in sources_to_search:
-            try:
-                source = get_source(source_name)
-                plan = build_release_search_plan(book)
-                releases = source.search(book, plan, expand_search=True, content_type=content_type)
-                all_releases.extend(releases)
-            except Exception as e:
-                logger.warning(f"Release search failed for {source_name} (request #{request_id}): {e}")
-                source_errors.append(source_name)
-
-        if not all_releases:
+        executor = ThreadPoolExecutor(
+            max_workers=len(sources_to_search), thread_name_prefix="reqsearch"
+        )
+        try:
+            futures = [
+                executor.submit(_search_one, source_name, book, plan, content_type)
+                for source_name in sources_to_search
+            ]
+            for source_name, future in zip(sources_to_search, futures):
+                try:
+                    releases = future.result()
+                except Exception as e:
+                    logger.warning(f"Release search failed for {source_name} (request #{request_id}): {e}")
+                    source_errors.append(source_name)
+                    continue
+                if releases:
+                    release = releases[0]
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if release is None:
             searched = ", ".join(s for s in sources_to_search if s not in source_errors) or "all sources"
             _safe_update_status("failed", admin_note=f"Not found on {searched}. Book may not be available for download yet.")
             return
 
-        # Pick the first (best) release
-        release = all_releases[0]
-
         # Get admin's user settings for download overrides
         user_overrides = user_db.get_user_settings(admin_user_id) if admin_user_id else {}
 
-        from dataclasses import asdict
         release_data = asdict(release)
         release_data["author"] = book.authors[0] if book.authors else None
         release_data["year"] = str(book.publish_year) if book.publish_year else None
@@ -749,7 +993,7 @@ def _auto_download_request(
         release_data["series_name"] = book.series_name
         release_data["series_position"] = book.series_position
 
-        success, error_msg = backend.queue_release(
+        success, error_msg = deps.orchestrator.queue_release(
             release_data, priority=0,
             user_id=admin_user_id,
             username=admin_username,
@@ -6,6 +6,7 @@ import ssl
 from dataclasses import dataclass
 from email.message import EmailMessage
 from email.utils import formatdate, make_msgid, parseaddr
+from functools import lru_cache
 from pathlib import Path
 from threading import Event
 from typing import Any, Dict, Mapping, Optional
@@ -131,7 +132,10 @@ def _render_subject(template: str, task: DownloadTask) -> str:
     return rendered or "Shelfmark"
 
 
-def _msgid_domain(from_addr: str) -> str:
+@lru_cache(maxsize=4)
+def msgid_domain(from_addr: str) -> str:
+    """Domain for Message-ID headers, taken from the From address."""
+    # From address rarely changes, so the parse is cached per address.
     try:
         from_email = parseaddr(from_addr)[1]
         domain = (from_email.partition("@")[2] or "").strip().rstrip(">")
@@ -152,7 +156,7 @@ def compose_email_message(
     message["To"] = recipient
     message["Subject"] = _render_subject(smtp_config.subject_template, task)
     message["Date"] = formatdate(localtime=True)
-    message["Message-ID"] = make_msgid(domain=_msgid_domain(smtp_config.from_addr))
+    message["Message-ID"] = make_msgid(domain=msgid_domain(smtp_config.from_addr))
 
     # Keep email body empty; attachments carry the content.
     message.set_content("")
@@ -179,8 +183,8 @@ def _create_tls_context(allow_unverified: bool) -> ssl.SSLContext:
     return context
 
 
-def test_smtp_connection(smtp_config: EmailSmtpConfig) -> None:
-    """Connect and (optionally) authenticate to the SMTP server. Does not send mail."""
+def open_smtp_connection(smtp_config: EmailSmtpConfig) -> smtplib.SMTP:
+    """Connect, negotiate TLS and (optionally) authenticate. Caller must close it."""
 
     smtp: Optional[smtplib.SMTP] = None
     try:
@@ -204,45 +208,40 @@ def test_smtp_connection(smtp_config: EmailSmtpConfig) -> None:
 
         if smtp_config.username:
             smtp.login(smtp_config.username, smtp_config.password)
+        return smtp
+    except BaseException:
+        if smtp is not None:
+            close_smtp_connection(smtp)
+        raise
+
+
+def close_smtp_connection(smtp: smtplib.SMTP) -> None:
+    """QUIT politely, falling back to dropping the socket."""
+    try:
+        smtp.quit()
+    except Exception:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+
+def test_smtp_connection(smtp_config: EmailSmtpConfig) -> None:
+    """Connect and (optionally) authenticate to the SMTP server. Does not send mail."""
+
+    try:
+        smtp = open_smtp_connection(smtp_config)
     except smtplib.SMTPAuthenticationError as exc:
         raise EmailOutputError("SMTP authentication failed") from exc
     except (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected, TimeoutError, OSError) as exc:
         raise EmailOutputError(f"Could not connect to SMTP server: {exc}") from exc
-    finally:
-        if smtp is not None:
-            try:
-                smtp.quit()
-            except Exception:
-                try:
-                    smtp.close()
-                except Exception:
-                    pass
+    close_smtp_connection(smtp)
 
 
 def send_email_message(smtp_config: EmailSmtpConfig, message: EmailMessage) -> None:
     smtp: Optional[smtplib.SMTP] = None
     try:
-        if smtp_config.security == SECURITY_SSL:
-            context = _create_tls_context(smtp_config.allow_unverified_tls)
-            smtp = smtplib.SMTP_SSL(
-                smtp_config.host,
-                smtp_config.port,
-                timeout=smtp_config.timeout_seconds,
-                context=context,
-            )
-        else:
-            smtp = smtplib.SMTP(smtp_config.host, smtp_config.port, timeout=smtp_config.timeout_seconds)
-
-        smtp.ehlo()
-
-        if smtp_config.security == SECURITY_STARTTLS:
-            context = _create_tls_context(smtp_config.allow_unverified_tls)
-            smtp.starttls(context=context)
-            smtp.ehlo()
-
-        if smtp_config.username:
-            smtp.login(smtp_config.username, smtp_config.password)
-
+        smtp = open_smtp_connection(smtp_config)
         smtp.send_message(message)
     except smtplib.SMTPAuthenticationError as exc:
         raise EmailOutputError("SMTP authentication failed") from exc
@@ -250,13 +249,7 @@ def send_email_message(smtp_config: EmailSmtpConfig, message: EmailMessage) -> N
         raise EmailOutputError(f"Failed to send email: {exc}") from exc
     finally:
         if smtp is not None:
-            try:
-                smtp.quit()
-            except Exception:
-                try:
-                    smtp.close()
-                except Exception:
-                    pass
+            close_smtp_connection(smtp)
 
 
 def _supports_email(task: DownloadTask) -> bool:
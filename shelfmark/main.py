@@ -1,5 +1,6 @@
 """Flask app - routes, WebSocket handlers, and middleware."""
 
+import atexit
 import io
 import logging
 import os
@@ -38,6 +39,7 @@ from shelfmark.core.auth_modes import (
     requires_admin_for_settings_access,
 )
 from shelfmark.core.cwa_user_sync import upsert_cwa_user
+from shelfmark.core.discord_notifications import queue_discord_book_available
 from shelfmark.core.external_user_linking import upsert_external_user
 from shelfmark.core.request_policy import (
     PolicyMode,
@@ -52,6 +54,7 @@ from shelfmark.core.requests_service import (
     sync_delivery_states_from_queue_status,
 )
 from shelfmark.core.activity_service import ActivityService, build_download_item_key
+from shelfmark.core.json_provider import install_json_provider
 from shelfmark.core.notifications import NotificationContext, NotificationEvent, notify_admin, notify_user
 from shelfmark.core.utils import is_safe_remote_http_url, normalize_base_path
 from shelfmark.api.websocket import ws_manager
@@ -65,6 +68,7 @@ FRONTEND_DIST = os.path.join(PROJECT_ROOT, 'frontend-dist')
 BASE_PATH = normalize_base_path(app_config.get("URL_BASE", ""))
 
 app = Flask(__name__)
+install_json_provider(app)
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # Disable caching
 app.config['APPLICATION_ROOT'] = BASE_PATH or '/'
 app.wsgi_app = ProxyFix(app.wsgi_app)  # type: ignore
@@ -140,6 +144,7 @@ try:
     from shelfmark.core.request_routes import _broadcast_request_update, register_request_routes
     request_db = RequestDB(_user_db_path)
     request_db.initialize()
+    atexit.register(request_db.close)
     register_request_routes(app, request_db, user_db)
     if not app.config.get("TESTING"):
         threading.Thread(
@@ -1198,13 +1203,12 @@ def _sync_request_db_on_terminal(task_id: str, status: QueueStatus) -> None:
         for req in reqs:
             req_id = req["id"]
             if status == QueueStatus.COMPLETE:
-                request_db.update_request_status(req_id, status="fulfilled")
+                # The updated row already carries the requester name the embed needs.
+                fulfilled_req = request_db.update_request_status(req_id, status="fulfilled")
                 logger.info("Request #%s marked fulfilled after download %s completed", req_id, task_id)
                 try:
-                    from shelfmark.core.discord_notifications import send_discord_book_available
-                    fulfilled_req = request_db.get_request(req_id)
                     if fulfilled_req:
-                        send_discord_book_available(
+                        queue_discord_book_available(
                             title=fulfilled_req.get("title", "Unknown"),
                             author=fulfilled_req.get("author"),
                             requester=fulfilled_req.get("requester_username"),
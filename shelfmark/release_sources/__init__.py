@@ -21,7 +21,7 @@ class ReleaseProtocol(str, Enum):
     DCC = "dcc"         # IRC DCC
 
 
-@dataclass
+@dataclass(slots=True)
 class Release:
     """A downloadable release - all sources return this same structure."""
     source: str                      # "direct", "prowlarr", "irc", etc.
@@ -1,14 +1,19 @@
 """Anna's Archive release source - JSON API integration."""
 
-import json
+import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from threading import Event
 from typing import Callable, List, Optional
 from urllib.parse import quote
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from shelfmark.core.cache import CacheService, cache_key
 from shelfmark.core.config import config
 from shelfmark.core.logger import setup_logger
 from shelfmark.core.models import DownloadTask
@@ -33,6 +38,46 @@ from shelfmark.release_sources.annasarchive import settings  # noqa: F401
 
 logger = setup_logger(__name__)
 
+# Shared keep-alive session for searches, downloads and the settings test so
+# repeat calls reuse pooled TLS connections. Transient gateway errors are
+# retried; the final response is still returned for raise_for_status().
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+})
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    ),
+))
+
+# Large reads keep per-chunk Python overhead low on multi-hundred-MB files, and
+# progress updates are capped at ~20/s since the UI can't show more than that.
+_DOWNLOAD_CHUNK_SIZE = 1 << 18
+_PROGRESS_INTERVAL = 0.05
+
+# (unit, divisor, format) indexed by floor(log1024(size)); sizes past GB stay in GB
+_SIZE_UNITS = (
+    ("B", 1, "{:.0f} {}"),
+    ("KB", 1024, "{:.1f} {}"),
+    ("MB", 1024 ** 2, "{:.1f} {}"),
+    ("GB", 1024 ** 3, "{:.2f} {}"),
+)
+
+# Search results are stable for a while, so repeat lookups (reopening the release
+# modal, retries) are served from memory for as long as the UI caches them.
+_SEARCH_CACHE_TTL = 3600
+_search_cache = CacheService(max_size=256)
+
+# Runs the fallback text search alongside the ISBN search so a miss costs one
+# round-trip instead of two.
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="AASearch")
+
 # Anna's Archive mirrors
 ANNASARCHIVE_MIRRORS = [
     "https://annas-archive.li",
@@ -41,17 +86,52 @@ ANNASARCHIVE_MIRRORS = [
 ]
 
 
+# Error responses are handled by status code rather than raise_for_status(), so the
+# rate-limited/forbidden path doesn't build and unwind an HTTPError every time.
+def _log_api_error(response: requests.Response) -> None:
+    if response.status_code == 403:
+        logger.error("Anna's Archive API returned 403 - check your API key or base URL")
+    else:
+        logger.error(f"Anna's Archive API HTTP error: {response.status_code} {response.reason}")
+
+
+def _report_download_error(
+    response: requests.Response,
+    status_callback: Callable[[str, Optional[str]], None],
+) -> None:
+    if response.status_code == 403:
+        status_callback("failed", "403 Forbidden - Check API key or mirror URL")
+    else:
+        status_callback("failed", f"HTTP {response.status_code}")
+    logger.error(
+        f"Anna's Archive download failed: {response.status_code} {response.reason} for url: {response.url}"
+    )
+
+
+# (config generation, base URL, API key) — re-read only after the config is refreshed
+_settings_cache: Optional[tuple[int, str, Optional[str]]] = None
+
+
+def _get_settings() -> tuple[str, Optional[str]]:
+    """Return the (base URL, API key) pair for the current config generation."""
+    global _settings_cache
+    generation = config.generation
+    cached = _settings_cache
+    if cached is None or cached[0] != generation:
+        base_url = config.get("ANNASARCHIVE_API_BASE_URL", "").strip() or ANNASARCHIVE_MIRRORS[0]
+        api_key = config.get("AA_DONATOR_KEY", "").strip() or None
+        cached = _settings_cache = (generation, base_url, api_key)
+    return cached[1], cached[2]
+
+
 def _get_base_url() -> str:
     """Get configured base URL or default."""
-    custom_url = config.get("ANNASARCHIVE_API_BASE_URL", "").strip()
-    if custom_url:
-        return custom_url
-    return ANNASARCHIVE_MIRRORS[0]
+    return _get_settings()[0]
 
 
 def _get_api_key() -> Optional[str]:
     """Get Anna's Archive API key (donator key)."""
-    return config.get("AA_DONATOR_KEY", "").strip() or None
+    return _get_settings()[1]
 
 
 @register_source("annasarchive")
@@ -65,10 +145,7 @@ class AnnasArchiveSource(ReleaseSource):
 
     def __init__(self):
         """Initialize Anna's Archive source."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        })
+        self.session = _session
 
     def is_available(self) -> bool:
         """Check if Anna's Archive is available."""
@@ -108,16 +185,50 @@ class AnnasArchiveSource(ReleaseSource):
             search_terms.append(book.authors[0])
 
         query = " ".join(search_terms)
+        isbn = book.isbn_13 or book.isbn_10
+
+        # Mirror and key are part of the key so settings changes never serve stale hits
+        key = cache_key(
+            "annasarchive:search",
+            content_type,
+            isbn or "",
+            query.lower(),
+            expand_search,
+            base_url,
+            hashlib.sha256(api_key.encode()).hexdigest()[:16],
+        )
+        cached = _search_cache.get(key)
+        if cached is not None:
+            return list(cached)
 
-        # Try ISBN search first if available
-        if book.isbn_13 or book.isbn_10:
-            isbn = book.isbn_13 or book.isbn_10
-            results = self._search_by_isbn(base_url, isbn, api_key, content_type)
-            if results:
-                return results
+        results = self._search_uncached(base_url, api_key, isbn, query, content_type, expand_search)
+        # Empty results may come from a swallowed network error, so only hits are cached
+        if results:
+            _search_cache.set(key, tuple(results), _SEARCH_CACHE_TTL)
+        return results
 
-        # Fall back to text search
-        return self._search_by_text(base_url, query, api_key, content_type, expand_search)
+    def _search_uncached(
+        self,
+        base_url: str,
+        api_key: str,
+        isbn: Optional[str],
+        query: str,
+        content_type: str,
+        expand_search: bool,
+    ) -> List[Release]:
+        """Query the API, preferring ISBN hits over the text search."""
+        if not isbn:
+            return self._search_by_text(base_url, query, api_key, content_type, expand_search)
+
+        # Start the text fallback in the background, then prefer ISBN results if any
+        text_future = _search_executor.submit(
+            self._search_by_text, base_url, query, api_key, content_type, expand_search
+        )
+        results = self._search_by_isbn(base_url, isbn, api_key, content_type)
+        if results:
+            text_future.cancel()
+            return results
+        return text_future.result()
 
     def _search_by_isbn(
         self,
@@ -137,17 +248,13 @@ class AnnasArchiveSource(ReleaseSource):
             }
 
             response = self.session.get(url, params=params, timeout=15)
-            response.raise_for_status()
+            if response.status_code >= 400:
+                _log_api_error(response)
+                return []
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return self._parse_search_results(data, content_type)
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 403:
-                logger.error("Anna's Archive API returned 403 - check your API key or base URL")
-            else:
-                logger.error(f"Anna's Archive API HTTP error: {e}")
-            return []
         except Exception as e:
             logger.error(f"Anna's Archive ISBN search failed: {e}")
             return []
@@ -174,17 +281,13 @@ class AnnasArchiveSource(ReleaseSource):
                 params["content"] = "book_unknown"  # AA uses different classification
 
             response = self.session.get(url, params=params, timeout=15)
-            response.raise_for_status()
+            if response.status_code >= 400:
+                _log_api_error(response)
+                return []
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return self._parse_search_results(data, content_type)
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 403:
-                logger.error("Anna's Archive API returned 403 - check your API key or base URL")
-            else:
-                logger.error(f"Anna's Archive API HTTP error: {e}")
-            return []
         except Exception as e:
             logger.error(f"Anna's Archive text search failed: {e}")
             return []
@@ -195,72 +298,86 @@ class AnnasArchiveSource(ReleaseSource):
         content_type: str
     ) -> List[Release]:
         """Parse search results from API response."""
-        releases = []
-
-        results = data.get("results", [])
-        for item in results:
-            try:
-                md5 = item.get("md5")
-                if not md5:
-                    continue
-
-                title = item.get("title", "Unknown")
-                authors = item.get("authors", [])
-                if authors:
-                    title = f"{title} - {', '.join(authors[:2])}"
-
-                file_format = item.get("extension", "").upper()
-                language = item.get("language", "")
-                size_bytes = item.get("filesize", 0)
-                size = self._format_size(size_bytes) if size_bytes else None
-
-                # Build fast download URL using API key
-                api_key = _get_api_key()
-                base_url = _get_base_url()
-                download_url = f"{base_url}/dyn/api/fast_download.json?md5={md5}&key={api_key}"
-
-                # Info URL to book page
-                info_url = f"{base_url}/md5/{md5}"
-
-                release = Release(
-                    source="annasarchive",
-                    source_id=md5,
-                    title=title,
-                    format=file_format,
-                    language=language,
-                    size=size,
-                    size_bytes=size_bytes,
-                    download_url=download_url,
-                    info_url=info_url,
-                    protocol=ReleaseProtocol.HTTP,
-                    indexer="Anna's Archive",
-                    content_type=content_type,
-                    extra={
-                        "md5": md5,
-                        "publisher": item.get("publisher"),
-                        "year": item.get("year"),
-                    }
-                )
-
-                releases.append(release)
-
-            except Exception as e:
-                logger.debug(f"Failed to parse Anna's Archive result: {e}")
-                continue
+        base_url = _get_base_url()
+        dl_prefix = f"{base_url}/dyn/api/fast_download.json?md5="
+        dl_suffix = f"&key={quote(_get_api_key() or '', safe='')}"
+        info_prefix = f"{base_url}/md5/"
+
+        results = data.get("results", []) if isinstance(data, dict) else []
+        build = self._build_release
+        seen: set[str] = set()
+        releases = [
+            release for release in (
+                build(item, dl_prefix, dl_suffix, info_prefix, content_type, seen)
+                for item in results
+            )
+            if release is not None
+        ]
 
         logger.info(f"Anna's Archive returned {len(releases)} releases")
         return releases
 
+    def _build_release(
+        self,
+        item: dict,
+        dl_prefix: str,
+        dl_suffix: str,
+        info_prefix: str,
+        content_type: str,
+        seen: set[str],
+    ) -> Optional[Release]:
+        """Build one release from an API hit, or None for unusable and duplicate hits."""
+        try:
+            # Skip unusable and mirrored duplicate hits before reading any other field
+            get = item.get
+            md5 = get("md5")
+            if not md5 or md5 in seen:
+                return None
+            seen.add(md5)
+
+            title = get("title", "Unknown")
+            authors = get("authors")
+            if authors:
+                title = f"{title} - {', '.join(authors[:2])}"
+
+            size_bytes = get("filesize", 0)
+
+            # Only carry the optional metadata the API actually returned
+            extra = {"md5": md5}
+            publisher = get("publisher")
+            if publisher:
+                extra["publisher"] = publisher
+            year = get("year")
+            if year:
+                extra["year"] = year
+
+            return Release(
+                source="annasarchive",
+                source_id=md5,
+                title=title,
+                format=get("extension", "").upper(),
+                language=get("language", ""),
+                size=self._format_size(size_bytes) if size_bytes else None,
+                size_bytes=size_bytes,
+                # Fast download URL (uses the API key) and the book's info page; one
+                # f-string builds the URL in a single allocation
+                download_url=f"{dl_prefix}{md5}{dl_suffix}",
+                info_url=info_prefix + md5,
+                protocol=ReleaseProtocol.HTTP,
+                indexer="Anna's Archive",
+                content_type=content_type,
+                extra=extra,
+            )
+
+        except Exception as e:
+            logger.debug(f"Failed to parse Anna's Archive result: {e}")
+            return None
+
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 ** 2:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 ** 3:
-            return f"{size_bytes / (1024 ** 2):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 ** 3):.2f} GB"
+        # Each unit spans 10 bits, so the bit length picks the unit directly
+        unit, divisor, template = _SIZE_UNITS[min(max(size_bytes.bit_length() - 1, 0) // 10, 3)]
+        return template.format(size_bytes / divisor, unit)
 
     def get_column_config(self) -> ReleaseColumnConfig:
         """Get column configuration for UI."""
@@ -293,7 +410,7 @@ class AnnasArchiveSource(ReleaseSource):
                 ),
             ],
             grid_template="minmax(0,2fr) 60px 80px 80px",
-            cache_ttl_seconds=3600,  # Cache for 1 hour (API results are stable)
+            cache_ttl_seconds=_SEARCH_CACHE_TTL,  # Cache for 1 hour (API results are stable)
             supported_filters=["format", "language"],
         )
 
@@ -304,7 +421,7 @@ class AnnasArchiveHandler(DownloadHandler):
 
     def __init__(self):
         """Initialize handler."""
-        self.session = requests.Session()
+        self.session = _session
 
     def download(
         self,
@@ -325,9 +442,11 @@ class AnnasArchiveHandler(DownloadHandler):
             # The download_url is already the fast API endpoint
             # First call returns JSON with actual download URL
             response = self.session.get(release.download_url, timeout=30)
-            response.raise_for_status()
+            if response.status_code >= 400:
+                _report_download_error(response, status_callback)
+                return None
 
-            result = response.json()
+            result = orjson.loads(response.content)
 
             # Extract actual download link from API response
             actual_url = result.get("download_url") or result.get("url")
@@ -340,34 +459,40 @@ class AnnasArchiveHandler(DownloadHandler):
             output_path = Path(TMP_DIR) / f"{release.source_id}.{release.format.lower()}"
 
             with self.session.get(actual_url, stream=True, timeout=60) as r:
-                r.raise_for_status()
+                if r.status_code >= 400:
+                    _report_download_error(r, status_callback)
+                    return None
                 total_size = int(r.headers.get('content-length', 0))
 
+                # Read straight from the raw stream into one reusable buffer instead of
+                # allocating a new bytes object per chunk through iter_content
+                r.raw.decode_content = True
+                buffer = bytearray(_DOWNLOAD_CHUNK_SIZE)
+                view = memoryview(buffer)
+
                 downloaded = 0
+                last_progress = 0.0
                 with open(output_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
+                    while True:
                         if cancel_flag.is_set():
                             logger.info("Download cancelled")
                             return None
 
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
+                        size = r.raw.readinto(buffer)
+                        if not size:
+                            break
+                        f.write(view[:size])
+                        downloaded += size
 
-                            if total_size:
-                                progress = (downloaded / total_size) * 100
-                                progress_callback(progress)
+                        if total_size:
+                            now = time.monotonic()
+                            if now - last_progress >= _PROGRESS_INTERVAL or downloaded >= total_size:
+                                last_progress = now
+                                progress_callback((downloaded / total_size) * 100)
 
             logger.info(f"Downloaded {output_path} ({downloaded} bytes)")
             return str(output_path)
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 403:
-                status_callback("failed", "403 Forbidden - Check API key or mirror URL")
-            else:
-                status_callback("failed", f"HTTP {e.response.status_code}")
-            logger.error(f"Anna's Archive download failed: {e}")
-            return None
         except Exception as e:
             status_callback("failed", str(e))
             logger.error(f"Anna's Archive download error: {e}")
@@ -16,6 +16,7 @@ from shelfmark.core.settings_registry import (
 def _test_annasarchive_api():
     """Test Anna's Archive API connection."""
     from shelfmark.core.config import config
+    from shelfmark.release_sources.annasarchive import _session
     import requests
 
     api_key = config.get("AA_DONATOR_KEY", "").strip()
@@ -26,7 +27,7 @@ def _test_annasarchive_api():
 
     try:
         # Try ping endpoint
-        response = requests.get(f"{base_url}/dyn/api/ping", timeout=10)
+        response = _session.get(f"{base_url}/dyn/api/ping", timeout=10)
         if response.status_code == 200:
             return {"success": True, "message": f"Successfully connected to {base_url}"}
         else:
@@ -67,7 +67,7 @@ export const useRequests = ({
     }
   }, [enabled]);
 
-  // WebSocket: listen for request_update events
+  // WebSocket: listen for request_update events (request_updates carries a coalesced burst)
   useEffect(() => {
     if (!enabled || !socket) return;
 
@@ -76,8 +76,10 @@ export const useRequests = ({
     };
 
     socket.on('request_update', handleRequestUpdate);
+    socket.on('request_updates', handleRequestUpdate);
     return () => {
       socket.off('request_update', handleRequestUpdate);
+      socket.off('request_updates', handleRequestUpdate);
     };
   }, [socket, enabled, fetchAll]);
 
@@ -366,9 +366,12 @@ export interface CreateBookRequestResponse extends BookRequest {
 
 export interface RequestsListResponse {
   requests: BookRequest[];
-  total: number;
+  /** Only present when requested with include_total=1. */
+  total?: number;
   limit: number;
   offset: number;
+  /** Pass as `cursor` to fetch the next page; null on the last page. */
+  next_cursor: string | null;
 }
 
 export interface RequestCounts {
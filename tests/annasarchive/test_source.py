@@ -0,0 +1,301 @@
+"""
+Tests for the Anna's Archive JSON API source.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shelfmark.release_sources.annasarchive import AnnasArchiveSource
+
+
+def _response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.reason = "OK" if status_code < 400 else "Forbidden"
+    response.content = json.dumps(payload).encode("utf-8")
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _book(**overrides):
+    values = {"title": "Dune", "authors": ["Frank Herbert"], "isbn_13": None, "isbn_10": None}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    from shelfmark.release_sources import annasarchive
+
+    annasarchive._search_cache.clear()
+    annasarchive._settings_cache = None
+    yield
+    annasarchive._search_cache.clear()
+    annasarchive._settings_cache = None
+
+
+@pytest.fixture
+def source():
+    settings = {
+        "AA_DONATOR_KEY": "se cret&x",
+        "ANNASARCHIVE_API_BASE_URL": "https://aa.example",
+    }
+    with patch(
+        "shelfmark.release_sources.annasarchive.config.get",
+        side_effect=lambda key, default=None: settings.get(key, default),
+    ):
+        src = AnnasArchiveSource()
+        src.session = MagicMock()
+        yield src
+
+
+class TestSearch:
+    def test_text_search_parses_results(self, source):
+        source.session.get.return_value = _response({"results": [
+            {"md5": "abc", "title": "Dune", "authors": ["Frank Herbert"],
+             "extension": "epub", "language": "en", "filesize": 2048,
+             "publisher": "Ace", "year": "1965"},
+            {"title": "No md5"},
+        ]})
+
+        releases = source.search(_book(), plan=None)
+
+        assert len(releases) == 1
+        release = releases[0]
+        assert release.source_id == "abc"
+        assert release.title == "Dune - Frank Herbert"
+        assert release.format == "EPUB"
+        assert release.size == "2.0 KB"
+        assert release.info_url == "https://aa.example/md5/abc"
+        assert release.download_url == (
+            "https://aa.example/dyn/api/fast_download.json?md5=abc&key=se%20cret%26x"
+        )
+        assert release.extra["publisher"] == "Ace"
+
+    def test_invalid_json_returns_no_results(self, source):
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b"<html>not json</html>"
+        source.session.get.return_value = response
+
+        assert source.search(_book(), plan=None) == []
+
+    def test_optional_metadata_is_only_kept_when_present(self, source):
+        source.session.get.return_value = _response({"results": [
+            {"md5": "abc", "title": "Dune", "extension": "epub"},
+            "not-a-dict",
+        ]})
+
+        releases = source.search(_book(), plan=None)
+
+        assert [r.source_id for r in releases] == ["abc"]
+        assert releases[0].extra == {"md5": "abc"}
+        assert releases[0].size is None
+
+    def test_error_status_returns_no_results_without_parsing(self, source):
+        response = _response({}, status_code=403)
+        source.session.get.return_value = response
+
+        assert source.search(_book(), plan=None) == []
+        response.raise_for_status.assert_not_called()
+
+    def test_duplicate_md5s_are_dropped(self, source):
+        source.session.get.return_value = _response({"results": [
+            {"md5": "abc", "title": "Dune", "extension": "epub"},
+            {"md5": "abc", "title": "Dune (mirror)", "extension": "pdf"},
+            {"md5": "def", "title": "Dune Messiah", "extension": "epub"},
+        ]})
+
+        releases = source.search(_book(), plan=None)
+
+        assert [(r.source_id, r.format) for r in releases] == [("abc", "EPUB"), ("def", "EPUB")]
+
+
+class TestSearchCache:
+    def test_repeat_search_is_served_from_cache(self, source):
+        source.session.get.return_value = _response({"results": [{"md5": "abc", "title": "Dune"}]})
+
+        first = source.search(_book(), plan=None)
+        second = source.search(_book(title="DUNE"), plan=None)
+
+        assert [r.source_id for r in second] == ["abc"]
+        assert second is not first
+        assert source.session.get.call_count == 1
+
+    def test_empty_results_are_not_cached(self, source):
+        source.session.get.return_value = _response({"results": []})
+        source.search(_book(), plan=None)
+        source.search(_book(), plan=None)
+
+        assert source.session.get.call_count == 2
+
+    def test_key_change_misses_cache(self, source):
+        from shelfmark.release_sources import annasarchive
+
+        source.session.get.return_value = _response({"results": [{"md5": "abc", "title": "Dune"}]})
+        source.search(_book(), plan=None)
+        with patch.object(annasarchive, "_get_api_key", return_value="other"):
+            source.search(_book(), plan=None)
+
+        assert source.session.get.call_count == 2
+
+
+class TestIsbnSearch:
+    @staticmethod
+    def _hit(md5):
+        return {"results": [{"md5": md5, "title": "Dune", "extension": "epub"}]}
+
+    def _route(self, source, isbn_payload, text_payload, text_started=None):
+        def get(url, params, timeout):
+            if params["q"].startswith("isbn:"):
+                if text_started is not None:
+                    assert text_started.wait(timeout=2), "text search was not started concurrently"
+                return _response(isbn_payload)
+            if text_started is not None:
+                text_started.set()
+            return _response(text_payload)
+
+        source.session.get.side_effect = get
+
+    def test_isbn_results_win(self, source):
+        self._route(source, self._hit("isbn"), self._hit("text"))
+
+        releases = source.search(_book(isbn_13="9780441013593"), plan=None)
+
+        assert [r.source_id for r in releases] == ["isbn"]
+
+    def test_isbn_miss_falls_back_to_text_results(self, source):
+        self._route(source, {"results": []}, self._hit("text"))
+
+        releases = source.search(_book(isbn_10="0441013597"), plan=None)
+
+        assert [r.source_id for r in releases] == ["text"]
+
+    def test_text_search_runs_while_isbn_search_is_in_flight(self, source):
+        self._route(source, {"results": []}, self._hit("text"), text_started=threading.Event())
+
+        releases = source.search(_book(isbn_13="9780441013593"), plan=None)
+
+        assert [r.source_id for r in releases] == ["text"]
+
+
+def test_source_and_handler_share_one_pooled_session():
+    from shelfmark.release_sources.annasarchive import AnnasArchiveHandler, _session
+
+    assert AnnasArchiveSource().session is _session
+    assert AnnasArchiveHandler().session is _session
+    adapter = _session.get_adapter("https://aa.example")
+    assert adapter.max_retries.total == 2
+
+
+class TestDownload:
+    def test_streams_into_reused_buffer_and_throttles_progress(self, tmp_path, monkeypatch):
+        from shelfmark.release_sources import annasarchive
+
+        monkeypatch.setattr("shelfmark.config.env.TMP_DIR", str(tmp_path))
+        monkeypatch.setattr(annasarchive.time, "monotonic", lambda: 100.0)
+
+        chunks = [b"a" * 10, b"b" * 10, b"c" * 10, b"d" * 10]
+        stream = MagicMock()
+        stream.status_code = 200
+        stream.headers = {"content-length": "40"}
+        pending = list(chunks)
+
+        def readinto(buffer):
+            if not pending:
+                return 0
+            chunk = pending.pop(0)
+            assert len(buffer) == annasarchive._DOWNLOAD_CHUNK_SIZE
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+
+        stream.raw.readinto.side_effect = readinto
+        stream.__enter__.return_value = stream
+
+        handler = annasarchive.AnnasArchiveHandler()
+        handler.session = MagicMock()
+        handler.session.get.side_effect = [_response({"download_url": "https://dl.example/f"}), stream]
+
+        task = SimpleNamespace(release=SimpleNamespace(
+            download_url="https://aa.example/dyn/api/fast_download.json?md5=abc",
+            source_id="abc",
+            format="EPUB",
+        ))
+        progress = []
+        path = handler.download(task, threading.Event(), progress.append, lambda *_: None)
+
+        assert path == str(tmp_path / "abc.epub")
+        assert (tmp_path / "abc.epub").read_bytes() == b"".join(chunks)
+        assert stream.raw.decode_content is True
+        # First chunk reports, the clock doesn't advance, then completion always reports
+        assert progress == [25.0, 100.0]
+
+    def test_forbidden_download_reports_failure(self, tmp_path, monkeypatch):
+        from shelfmark.release_sources import annasarchive
+
+        monkeypatch.setattr("shelfmark.config.env.TMP_DIR", str(tmp_path))
+        handler = annasarchive.AnnasArchiveHandler()
+        handler.session = MagicMock()
+        handler.session.get.return_value = _response({}, status_code=403)
+        task = SimpleNamespace(release=SimpleNamespace(
+            download_url="https://aa.example/x", source_id="abc", format="EPUB",
+        ))
+        statuses = []
+
+        result = handler.download(task, threading.Event(), lambda _: None,
+                                  lambda *args: statuses.append(args))
+
+        assert result is None
+        assert statuses[-1] == ("failed", "403 Forbidden - Check API key or mirror URL")
+
+    def test_cancel_stops_before_next_read(self, tmp_path, monkeypatch):
+        from shelfmark.release_sources import annasarchive
+
+        monkeypatch.setattr("shelfmark.config.env.TMP_DIR", str(tmp_path))
+        cancel = threading.Event()
+        cancel.set()
+        stream = MagicMock()
+        stream.status_code = 200
+        stream.headers = {}
+        stream.__enter__.return_value = stream
+
+        handler = annasarchive.AnnasArchiveHandler()
+        handler.session = MagicMock()
+        handler.session.get.side_effect = [_response({"url": "https://dl.example/f"}), stream]
+        task = SimpleNamespace(release=SimpleNamespace(
+            download_url="https://aa.example/x", source_id="abc", format="EPUB",
+        ))
+
+        assert handler.download(task, cancel, lambda _: None, lambda *_: None) is None
+        stream.raw.readinto.assert_not_called()
+
+
+@pytest.mark.parametrize("size, expected", [
+    (0, "0 B"),
+    (1023, "1023 B"),
+    (1024, "1.0 KB"),
+    (1024 ** 2 - 1, "1024.0 KB"),
+    (1024 ** 2, "1.0 MB"),
+    (5 * 1024 ** 3 // 2, "2.50 GB"),
+    (3 * 1024 ** 4, "3072.00 GB"),
+])
+def test_format_size_unit_boundaries(size, expected):
+    assert AnnasArchiveSource()._format_size(size) == expected
+
+
+def test_settings_are_read_once_per_config_generation(source):
+    from shelfmark.release_sources import annasarchive
+
+    with patch.object(annasarchive.config, "get", wraps=annasarchive.config.get) as get:
+        assert annasarchive._get_base_url() == "https://aa.example"
+        assert annasarchive._get_api_key() == "se cret&x"
+        assert annasarchive._get_base_url() == "https://aa.example"
+        assert get.call_count == 2
+
+        with patch.object(type(annasarchive.config), "generation", property(lambda self: -1)):
+            annasarchive._get_api_key()
+        assert get.call_count == 4
@@ -60,3 +60,47 @@ class TestAbsRefresh:
              patch('shelfmark.core.abs_routes.abs_client.refresh', return_value=0):
             resp = client.post('/api/abs/refresh')
         assert resp.status_code == 200
+
+
+class TestAuthModeCache:
+    @pytest.fixture(autouse=True)
+    def _reset_cache(self):
+        from shelfmark.core import abs_routes
+        abs_routes._AUTH_MODE_CACHE.update(value=None, mtime=None)
+        yield
+        abs_routes._AUTH_MODE_CACHE.update(value=None, mtime=None)
+
+    def test_reuses_value_until_file_changes(self, tmp_path):
+        import os
+        from shelfmark.core.abs_routes import _get_auth_mode
+        security = tmp_path / "security.json"
+        security.write_text(json.dumps({"AUTH_METHOD": "builtin"}))
+
+        with patch("shelfmark.core.settings_registry._get_config_file_path", return_value=security), \
+             patch("shelfmark.core.settings_registry.load_config_file",
+                   side_effect=lambda tab: json.loads(security.read_text())) as load:
+            assert _get_auth_mode() == "builtin"
+            assert _get_auth_mode() == "builtin"
+            assert load.call_count == 1
+
+            security.write_text(json.dumps({"AUTH_METHOD": "oidc"}))
+            stat = security.stat()
+            os.utime(security, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert _get_auth_mode() == "oidc"
+            assert load.call_count == 2
+
+    def test_guards_see_file_edits_without_config_refresh(self, client, tmp_path):
+        import os
+        security = tmp_path / "security.json"
+        security.write_text(json.dumps({"AUTH_METHOD": "none"}))
+
+        with patch("shelfmark.core.settings_registry._get_config_file_path", return_value=security), \
+             patch("shelfmark.core.settings_registry.load_config_file",
+                   side_effect=lambda tab: json.loads(security.read_text())), \
+             patch('shelfmark.core.abs_routes.abs_client.find_match', return_value=None):
+            assert client.get('/api/abs/check?title=Dune').status_code == 200
+
+            security.write_text(json.dumps({"AUTH_METHOD": "builtin"}))
+            stat = security.stat()
+            os.utime(security, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert client.get('/api/abs/check?title=Dune').status_code == 401
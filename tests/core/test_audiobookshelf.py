@@ -1,6 +1,15 @@
 """Tests for the Audiobookshelf library client."""
+import os
+import threading
 from unittest.mock import MagicMock, patch
-from shelfmark.core.audiobookshelf import ABSClient, _normalize
+
+import pytest
+from shelfmark.core.audiobookshelf import ABSClient, _normalize, _retry_delay
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CONFIG_DIR", str(tmp_path))
 
 
 class TestNormalize:
@@ -13,11 +22,31 @@ class TestNormalize:
     def test_handles_empty(self):
         assert _normalize("") == ""
 
+    def test_keeps_underscores_and_digits(self):
+        assert _normalize("Catch_22: A Novel") == "catch_22 a novel"
+
+    def test_non_ascii_matches_regex_semantics(self):
+        assert _normalize("Les Misérables — Tome 1!") == "les misérables  tome 1"
+
+    def test_latin1_table_matches_regex_for_every_code_point(self):
+        import re
+
+        punct = re.compile(r"[^\w\s]")
+        for c in range(256):
+            ch = chr(c).lower()
+            assert _normalize(f"a{ch}b") == punct.sub("", f"a{ch}b").strip()
+
+    def test_strips_latin1_punctuation(self):
+        assert _normalize("«Le Petit Prince» ¿Qué?") == "le petit prince qué"
+
 
 class TestABSClientFindMatch:
     def _client_with_cache(self, items):
         client = ABSClient()
-        client._cache = items
+        client._set_cache(
+            [item["id"] for item in items],
+            [(item["title"], item["author"]) for item in items],
+        )
         return client
 
     def test_exact_title_author_match(self):
@@ -63,12 +92,74 @@ class TestABSClientFindMatch:
 
     def test_empty_cache_returns_none(self):
         client = ABSClient()
-        client._cache = []
         with patch.object(client, 'refresh', return_value=0):
             with patch.object(client, 'is_configured', return_value=False):
                 result = client.find_match("Any Book", "Any Author")
         assert result is None
 
+    def test_refresh_publishes_new_snapshot(self):
+        client = self._client_with_cache([
+            {"id": "1", "title": "The Hobbit", "author": "Tolkien"},
+        ])
+        before = client._cache
+        client._set_cache(["2"], [("Dune", "Herbert")])
+        assert client._cache is not before
+        assert before.ids == ("1",)
+        assert client.find_match("Dune", "Herbert")["id"] == "2"
+
+    def test_snapshot_is_read_only(self):
+        client = self._client_with_cache([
+            {"id": "1", "title": "The Hobbit", "author": "Tolkien"},
+        ])
+        snapshot = client._cache
+        assert isinstance(snapshot.ids, tuple)
+        assert isinstance(snapshot.norm_titles, tuple)
+        with pytest.raises(TypeError):
+            snapshot.title_index["dune"] = (0,)
+
+    def test_fails_open_while_background_refresh_is_pending(self):
+        client = ABSClient()
+        client._refresh_thread = MagicMock()
+        client._refresh_thread.is_alive.return_value = True
+        with patch.object(client, "is_configured", return_value=True), \
+             patch.object(client, "refresh") as refresh:
+            assert client.find_match("The Hobbit", "Tolkien") is None
+        refresh.assert_not_called()
+
+    def test_concurrent_cold_callers_share_one_refresh(self):
+        client = ABSClient()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_refresh():
+            started.set()
+            release.wait(5)
+            client._set_cache(["1"], [("The Hobbit", "Tolkien")])
+            return 1
+
+        results = []
+        with patch.object(client, "is_configured", return_value=True), \
+             patch.object(client, "refresh", side_effect=slow_refresh) as refresh:
+            threads = [
+                threading.Thread(target=lambda: results.append(client.find_match("The Hobbit", "Tolkien")))
+                for _ in range(4)
+            ]
+            threads[0].start()
+            started.wait(5)
+            for t in threads[1:]:
+                t.start()
+            release.set()
+            for t in threads:
+                t.join(5)
+        assert refresh.call_count == 1
+        assert len(results) == 4 and all(r and r["id"] == "1" for r in results)
+
+    def test_populated_empty_cache_does_not_refresh(self):
+        client = self._client_with_cache([])
+        with patch.object(client, "refresh") as refresh:
+            assert client.find_match("The Hobbit", "Tolkien") is None
+        refresh.assert_not_called()
+
     def test_no_author_title_match_only(self):
         """If no author info on either side, title match alone is sufficient."""
         client = self._client_with_cache([
@@ -76,6 +167,58 @@ class TestABSClientFindMatch:
         ])
         assert client.find_match("The Hobbit", "") is not None
 
+    def test_prefers_candidate_with_matching_author(self):
+        client = self._client_with_cache([
+            {"id": "1", "title": "The Hobbit", "author": "Someone Else"},
+            {"id": "2", "title": "The Hobbit", "author": "Tolkien"},
+        ])
+        match = client.find_match("The Hobbit", "Tolkien")
+        assert match is not None and match["id"] == "2"
+
+    def test_prefix_match_among_many_items(self):
+        items = [
+            {"id": str(i), "title": f"Unrelated Title {i}", "author": "Nobody"}
+            for i in range(50)
+        ]
+        items.append({"id": "hobbit", "title": "The Hobbit A Novel", "author": "Tolkien"})
+        client = self._client_with_cache(items)
+        match = client.find_match("The Hobbit", "Tolkien")
+        assert match is not None and match["id"] == "hobbit"
+
+    def test_prefix_match_with_low_ratio_among_close_distractors(self):
+        distractors = [
+            "The Host", "The Hunt", "The Robot", "The Habit", "The Hobbyist",
+            "The Rabbit", "The Bobbin", "The Hornet",
+        ]
+        items = [
+            {"id": str(i), "title": title, "author": "Someone Else"}
+            for i, title in enumerate(distractors)
+        ]
+        items.append({
+            "id": "hobbit", "title": "The Hobbit or There and Back Again", "author": "J.R.R. Tolkien",
+        })
+        client = self._client_with_cache(items)
+        match = client.find_match("The Hobbit", "J.R.R. Tolkien")
+        assert match is not None and match["id"] == "hobbit"
+
+    def test_exact_title_uses_index_without_fuzzy_scoring(self):
+        client = self._client_with_cache([
+            {"id": "1", "title": "The Hobbit", "author": "Tolkien"},
+        ])
+        with patch.object(client, "_match_rapidfuzz") as fuzzy:
+            match = client.find_match("the hobbit!", "Tolkien")
+        assert match is not None and match["id"] == "1"
+        fuzzy.assert_not_called()
+
+    def test_long_prefix_uses_index(self):
+        client = self._client_with_cache([
+            {"id": "1", "title": "A Song of Ice and Fire: A Game of Thrones", "author": "Martin"},
+        ])
+        with patch.object(client, "_match_rapidfuzz") as fuzzy:
+            match = client.find_match("A Song of Ice and Fire", "Martin")
+        assert match is not None and match["id"] == "1"
+        fuzzy.assert_not_called()
+
 
 class TestABSClientRefresh:
     def test_refresh_populates_cache(self):
@@ -90,12 +233,61 @@ class TestABSClientRefresh:
                 {"id": "item1", "media": {"metadata": {"title": "The Hobbit", "authorName": "Tolkien"}}}
             ]
         }
-        with patch("shelfmark.core.audiobookshelf.http_requests.get") as mock_get:
+        with patch.object(client._session, "get") as mock_get:
             mock_get.side_effect = [mock_response_libraries, mock_response_items]
             with patch.object(client, "_get_credentials", return_value=("http://abs:8080", "token123")):
                 count = client.refresh()
         assert count == 1
-        assert client._cache[0]["title"] == "The Hobbit"
+        assert client._session.headers["Authorization"] == "Bearer token123"
+        assert client._cache.ids == ("item1",)
+        assert client._cache.display[0] == ("The Hobbit", "Tolkien")
+
+    def test_refresh_paginates_library_items(self):
+        client = ABSClient()
+        libraries = MagicMock()
+        libraries.json.return_value = {"libraries": [{"id": "lib1", "mediaType": "book"}]}
+
+        def page(start, count):
+            resp = MagicMock()
+            resp.json.return_value = {"results": [
+                {"id": f"item{i}", "media": {"metadata": {"title": f"Book {i}", "authorName": "A"}}}
+                for i in range(start, start + count)
+            ]}
+            return resp
+
+        with patch("shelfmark.core.audiobookshelf._ITEMS_PAGE_SIZE", 2), \
+             patch.object(client._session, "get") as mock_get:
+            mock_get.side_effect = [libraries, page(0, 2), page(2, 1)]
+            with patch.object(client, "_get_credentials", return_value=("http://abs:8080", "token")):
+                count = client.refresh()
+        assert count == 3
+        assert [c.kwargs["params"]["page"] for c in mock_get.call_args_list[1:]] == [0, 1]
+
+    def test_refresh_crawls_libraries_concurrently_in_order(self):
+        client = ABSClient()
+        libraries = MagicMock()
+        libraries.json.return_value = {"libraries": [
+            {"id": "lib1", "mediaType": "book"},
+            {"id": "lib2", "mediaType": "book"},
+        ]}
+        both_in_flight = threading.Barrier(2, timeout=2)
+
+        def get(url, **kwargs):
+            if url.endswith("/api/libraries"):
+                return libraries
+            lib_id = url.split("/")[-2]
+            both_in_flight.wait()
+            resp = MagicMock()
+            resp.json.return_value = {"results": [
+                {"id": f"{lib_id}-item", "media": {"metadata": {"title": lib_id, "authorName": "A"}}}
+            ]}
+            return resp
+
+        with patch.object(client._session, "get", side_effect=get), \
+             patch.object(client, "_get_credentials", return_value=("http://abs:8080", "token")):
+            count = client.refresh()
+        assert count == 2
+        assert client._cache.ids == ("lib1-item", "lib2-item")
 
     def test_refresh_skips_non_book_libraries(self):
         client = ABSClient()
@@ -106,14 +298,14 @@ class TestABSClientRefresh:
                 {"id": "lib2", "mediaType": "podcast"},
             ]
         }
-        with patch("shelfmark.core.audiobookshelf.http_requests.get", return_value=mock_resp):
+        with patch.object(client._session, "get", return_value=mock_resp):
             with patch.object(client, "_get_credentials", return_value=("http://abs:8080", "token")):
                 count = client.refresh()
         assert count == 0
 
     def test_refresh_fails_open_on_error(self):
         client = ABSClient()
-        with patch("shelfmark.core.audiobookshelf.http_requests.get", side_effect=Exception("timeout")):
+        with patch.object(client._session, "get", side_effect=Exception("timeout")):
             with patch.object(client, "_get_credentials", return_value=("http://abs:8080", "token")):
                 count = client.refresh()
         assert count == 0
@@ -122,3 +314,73 @@ class TestABSClientRefresh:
         client = ABSClient()
         with patch("shelfmark.core.audiobookshelf.config.get", return_value=""):
             assert client.is_configured() is False
+
+
+class TestPersistedCache:
+    URL = "http://abs:8080"
+
+    def _refreshed_client(self):
+        client = ABSClient()
+        libraries = MagicMock()
+        libraries.json.return_value = {"libraries": [{"id": "lib1", "mediaType": "book"}]}
+        items = MagicMock()
+        items.json.return_value = {"results": [
+            {"id": "item1", "media": {"metadata": {"title": "The Hobbit", "authorName": "Tolkien"}}}
+        ]}
+        with patch.object(client._session, "get", side_effect=[libraries, items]), \
+             patch.object(client, "_get_credentials", return_value=(self.URL, "token")):
+            assert client.refresh() == 1
+        return client
+
+    def test_refresh_snapshot_is_reloaded_by_a_new_client(self):
+        self._refreshed_client()
+
+        fresh = ABSClient()
+        with patch.object(fresh, "_get_credentials", return_value=(self.URL, "token")):
+            assert fresh._load_persisted() is True
+        assert fresh._populated.is_set()
+        assert fresh.find_match("The Hobbit", "Tolkien")["id"] == "item1"
+
+    def test_snapshot_from_another_server_is_ignored(self):
+        self._refreshed_client()
+
+        fresh = ABSClient()
+        with patch.object(fresh, "_get_credentials", return_value=("http://other:8080", "token")):
+            assert fresh._load_persisted() is False
+        assert not fresh._populated.is_set()
+
+    def test_stale_snapshot_is_ignored(self):
+        self._refreshed_client()
+        path = ABSClient._persisted_path()
+        old = path.stat().st_mtime - 2 * 3600
+        os.utime(path, (old, old))
+
+        fresh = ABSClient()
+        with patch.object(fresh, "_get_credentials", return_value=(self.URL, "token")):
+            assert fresh._load_persisted() is False
+
+    def test_corrupt_snapshot_is_ignored(self):
+        ABSClient._persisted_path().write_bytes(b"{not json")
+
+        fresh = ABSClient()
+        with patch.object(fresh, "_get_credentials", return_value=(self.URL, "token")):
+            assert fresh._load_persisted() is False
+
+    def test_background_refresh_publishes_snapshot_before_crawling(self):
+        self._refreshed_client()
+
+        fresh = ABSClient()
+        with patch.object(fresh, "_get_credentials", return_value=(self.URL, "token")), \
+             patch("shelfmark.core.audiobookshelf.threading.Thread") as thread_cls:
+            fresh.start_background_refresh()
+        thread_cls.return_value.start.assert_called_once()
+        assert fresh.find_match("The Hobbit", "Tolkien")["id"] == "item1"
+
+
+class TestRetryDelay:
+    def test_backs_off_exponentially(self):
+        assert 15 <= _retry_delay(0) <= 30
+        assert 30 <= _retry_delay(1) <= 60
+
+    def test_capped(self):
+        assert 150 <= _retry_delay(20) <= 300
@@ -0,0 +1,67 @@
+"""Tests for the orjson-backed Flask JSON provider."""
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+from shelfmark.core.json_provider import OrjsonProvider, install_json_provider
+
+
+@dataclass
+class _Row:
+    id: int
+    title: str
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    install_json_provider(app)
+
+    @app.post("/echo")
+    def echo():
+        return jsonify(request.get_json())
+
+    return app
+
+
+def test_install_replaces_provider(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_output_matches_default_provider(app):
+    default = DefaultJSONProvider(app)
+    payload = {
+        "b": 1,
+        "a": [_Row(1, "Dune")],
+        "when": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "price": Decimal("1.50"),
+        7: "int key",
+    }
+    expected = json.loads(default.dumps({str(k): v for k, v in payload.items()}))
+
+    assert json.loads(app.json.dumps(payload)) == expected
+    assert app.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+
+def test_unsupported_values_fall_back_to_stdlib(app):
+    assert app.json.dumps({"n": 2 ** 70}) == '{"n": 1180591620717411303424}'
+
+
+def test_request_round_trip(app):
+    client = app.test_client()
+    resp = client.post("/echo", json={"title": "Les Misérables", "n": 3})
+
+    assert resp.status_code == 200
+    assert resp.get_json() == {"n": 3, "title": "Les Misérables"}
+
+
+def test_invalid_body_is_a_bad_request(app):
+    client = app.test_client()
+    resp = client.post("/echo", data=b"{nope", content_type="application/json")
+
+    assert resp.status_code == 400
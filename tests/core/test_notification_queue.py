@@ -0,0 +1,60 @@
+"""Tests for the background notification dispatch queue."""
+import queue
+import threading
+from unittest.mock import patch
+
+from shelfmark.core import notification_queue
+from shelfmark.core.notification_queue import enqueue_batched, enqueue_notification, wait_until_idle
+
+
+def test_enqueued_notification_runs_on_worker_thread():
+    seen = []
+    assert enqueue_notification("test", lambda value: seen.append((value, threading.current_thread().name)), 42)
+    wait_until_idle()
+    assert seen == [(42, "notification-dispatch")]
+
+
+def test_failing_notification_does_not_stop_worker():
+    def boom():
+        raise RuntimeError("webhook down")
+
+    seen = []
+    enqueue_notification("boom", boom)
+    enqueue_notification("ok", seen.append, "done")
+    wait_until_idle()
+    assert seen == ["done"]
+
+
+def test_full_queue_drops_notification():
+    full = queue.Queue(maxsize=1)
+    full.put_nowait(("blocked", lambda: None, (), False))
+    with patch.object(notification_queue, "_queue", full), \
+         patch.object(notification_queue, "_ensure_worker"):
+        assert enqueue_notification("dropped", lambda: None) is False
+
+
+def test_batched_items_in_one_tick_share_a_call():
+    calls = []
+    jobs = [
+        ("a", calls.append, ("x",), True),
+        ("plain", calls.append, ("plain",), False),
+        ("a", calls.append, ("y",), True),
+    ]
+    notification_queue._process(jobs)
+    assert calls == ["plain", ["x", "y"]]
+
+
+def test_enqueue_batched_delivers_list():
+    seen = []
+    assert enqueue_batched("batch", seen.append, {"n": 1})
+    wait_until_idle()
+    assert seen == [[{"n": 1}]]
+
+
+def test_batched_items_arriving_within_linger_share_a_call():
+    seen = []
+    assert enqueue_batched("batch", seen.append, 1)
+    threading.Event().wait(notification_queue._BATCH_LINGER_SECONDS / 5)
+    assert enqueue_batched("batch", seen.append, 2)
+    wait_until_idle()
+    assert seen == [[1, 2]]
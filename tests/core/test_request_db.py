@@ -0,0 +1,497 @@
+"""Tests for RequestDB connection setup and query helpers."""
+
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from shelfmark.core.request_db import RequestDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            display_name TEXT,
+            requests_last_viewed_at TIMESTAMP
+        )"""
+    )
+    conn.execute("INSERT INTO users (username) VALUES ('alice')")
+    conn.execute("INSERT INTO users (username) VALUES ('bob')")
+    conn.commit()
+    conn.close()
+
+    request_db = RequestDB(db_path)
+    request_db.initialize()
+    return request_db
+
+
+def test_initialize_switches_database_to_wal(db):
+    with db._connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 256 * 1024 * 1024
+
+
+def test_connection_is_reused_across_calls(db):
+    with db._connection() as first:
+        pass
+    with db._connection() as second:
+        pass
+
+    assert first is second
+
+
+def test_connection_is_reused_across_threads(db):
+    with db._connection() as main_conn:
+        pass
+    seen = []
+
+    def worker():
+        with db._connection() as conn:
+            seen.append(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen == [main_conn]
+
+
+def test_concurrent_checkouts_get_separate_connections(db):
+    with db._connection() as outer:
+        with db._connection() as inner:
+            assert inner is not outer
+
+
+def test_connection_is_returned_to_the_pool_outside_a_transaction(db):
+    with pytest.raises(RuntimeError):
+        with db._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            raise RuntimeError("boom")
+
+    with db._connection() as reused:
+        assert reused is conn
+        assert reused.in_transaction is False
+
+
+def test_connections_under_gevent_are_pooled_across_greenlets(tmp_path):
+    pytest.importorskip("gevent")
+    script = textwrap.dedent(
+        """
+        from gevent import monkey
+        monkey.patch_all()
+
+        import sqlite3
+        import sys
+
+        import gevent
+
+        from shelfmark.core.request_db import RequestDB
+
+        opened = []
+        real_connect = sqlite3.connect
+
+        def counting_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        sqlite3.connect = counting_connect
+
+        db_path = sys.argv[1]
+        conn = real_connect(db_path)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, display_name TEXT)")
+        conn.execute("INSERT INTO users (username) VALUES ('alice')")
+        conn.commit()
+        conn.close()
+
+        db = RequestDB(db_path)
+        db.initialize()
+
+        def handle_request(n):
+            db.create_request(user_id=1, title=f"Book {n}")
+            gevent.sleep(0)
+            db.count_requests()
+
+        gevent.joinall([gevent.spawn(handle_request, n) for n in range(20)])
+        assert db.count_requests() == 20
+        print(len(opened))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path / "gevent.db")],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout.split()[-1]) == 1
+
+
+def test_close_releases_connections_and_reopens_lazily(db):
+    req = db.create_request(user_id=1, title="Dune")
+    with db._connection() as old_conn:
+        pass
+
+    db.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        old_conn.execute("SELECT 1")
+    assert db.get_request(req["id"])["title"] == "Dune"
+
+
+def test_update_request_status_only_touches_given_columns(db):
+    req = db.create_request(user_id=1, title="Dune")
+    db.update_request_status(req["id"], "approved", admin_note="ok", approved_by=2)
+
+    updated = db.update_request_status(req["id"], "downloading", download_task_id="task-1")
+
+    assert updated["status"] == "downloading"
+    assert updated["admin_note"] == "ok"
+    assert updated["approved_by"] == 2
+    assert updated["download_task_id"] == "task-1"
+
+
+def test_update_request_metadata_can_clear_release_date(db):
+    req = db.create_request(user_id=1, title="Dune")
+    db.update_request_metadata(req["id"], provider="hardcover", expected_release_date="2030-01-01")
+
+    updated = db.update_request_metadata(req["id"], clear_expected_release_date=True, is_released=True)
+
+    assert updated["provider"] == "hardcover"
+    assert updated["expected_release_date"] is None
+    assert updated["is_released"] == 1
+
+
+def test_list_and_count_filter_combinations(db):
+    first = db.create_request(user_id=1, title="Dune")
+    db.create_request(user_id=1, title="Emma")
+    hidden = db.create_request(user_id=2, title="Hyperion")
+    db.update_request_status(first["id"], "approved")
+    db.hide_request_from_admin(hidden["id"])
+
+    assert {r["title"] for r in db.list_requests()} == {"Dune", "Emma"}
+    assert len(db.list_requests(include_hidden_from_admin=True)) == 3
+    assert [r["title"] for r in db.list_requests(user_id=2)] == ["Hyperion"]
+    assert [r["title"] for r in db.list_requests(status="approved")] == ["Dune"]
+    assert [r["title"] for r in db.list_requests(user_id=1, status="pending")] == ["Emma"]
+    assert len(db.list_requests(limit=1)) == 1
+
+    assert db.count_requests() == 3
+    assert db.count_requests(user_id=1) == 2
+    assert db.count_requests(status="pending") == 2
+    assert db.count_requests(user_id=2, status="approved") == 0
+
+
+def test_mutations_return_same_shape_as_get_request(db):
+    created = db.create_request(user_id=1, title="Dune")
+    assert created == db.get_request(created["id"])
+    assert created["requester_username"] == "alice"
+    assert created["handled_by_username"] is None
+
+    updated = db.update_request_status(created["id"], "approved", approved_by=2)
+    assert updated == db.get_request(created["id"])
+    assert updated["handled_by_username"] == "bob"
+
+    updated = db.update_request_metadata(created["id"], provider="hardcover")
+    assert updated == db.get_request(created["id"])
+
+
+def test_mutations_on_missing_request_return_none(db):
+    assert db.update_request_status(999, "approved") is None
+    assert db.update_request_metadata(999, provider="hardcover") is None
+
+
+def test_create_requests_bulk_inserts_all_rows_in_order(db):
+    rows = [
+        {"user_id": 1 + (i % 2), "title": f"Book {i}", "cover_url": "javascript:alert(1)"}
+        for i in range(150)
+    ]
+    rows[0]["content_type"] = "audiobook"
+    rows[0]["cover_url"] = "https://example.com/c.jpg"
+
+    ids = db.create_requests_bulk(rows)
+
+    assert len(ids) == 150
+    assert [db.get_request(i)["title"] for i in ids[:3]] == ["Book 0", "Book 1", "Book 2"]
+    first = db.get_request(ids[0])
+    assert first["content_type"] == "audiobook"
+    assert first["cover_url"] == "https://example.com/c.jpg"
+    assert db.get_request(ids[-1])["cover_url"] is None
+    assert db.count_requests() == 150
+
+
+def test_create_requests_bulk_rejects_invalid_rows_without_inserting(db):
+    with pytest.raises(ValueError):
+        db.create_requests_bulk([
+            {"user_id": 1, "title": "Dune"},
+            {"user_id": 1, "title": "Emma", "content_type": "magazine"},
+        ])
+
+    assert db.count_requests() == 0
+    assert db.create_requests_bulk([]) == []
+
+
+def test_concurrent_writers_from_many_threads(db):
+    req = db.create_request(user_id=1, title="Dune")
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(10):
+                db.create_request(user_id=1, title=f"Book {n}-{i}")
+                db.update_request_metadata(req["id"], provider=f"p{n}")
+        except Exception as exc:  # pragma: no cover - surfaced via assertion
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert db.count_requests() == 41
+
+
+def test_get_request_without_users_skips_name_columns(db):
+    req = db.create_request(user_id=1, title="Dune")
+
+    raw = db.get_request(req["id"], include_users=False)
+
+    assert raw["title"] == "Dune"
+    assert "requester_username" not in raw
+    assert db.get_request(999, include_users=False) is None
+
+
+def _query_plan(db, sql, params=()):
+    with db._connection() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " ".join(r["detail"] for r in rows)
+
+
+def test_initialize_creates_request_indexes(db):
+    with db._connection() as conn:
+        names = {
+            r["name"]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='requests'"
+            )
+        }
+    assert {
+        "idx_requests_user_created",
+        "idx_requests_status_created",
+        "idx_requests_user_updated",
+        "idx_requests_download_task",
+    } <= names
+
+    plan = _query_plan(
+        db, "SELECT * FROM requests WHERE download_task_id = ?", ("task-1",)
+    )
+    assert "idx_requests_download_task" in plan
+
+
+def test_list_methods_return_rows_with_mapping_access(db):
+    req = db.create_request(user_id=1, title="Dune")
+    db.update_request_status(req["id"], "downloading", download_task_id="task-1")
+
+    (listed,) = db.list_requests(user_id=1)
+    (linked,) = db.get_requests_by_download_task("task-1")
+
+    for row in (listed, linked):
+        assert row["title"] == "Dune"
+        assert row.get("provider") is None
+        assert row.get("missing_column", "fallback") == "fallback"
+    assert dict(listed) == db.get_request(req["id"])
+
+
+def test_migration_2_rebuilds_table_and_keeps_rows(tmp_path):
+    db_path = str(tmp_path / "v1.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL,"
+        " display_name TEXT, requests_last_viewed_at TIMESTAMP)"
+    )
+    conn.execute("INSERT INTO users (username) VALUES ('alice')")
+    conn.execute("CREATE TABLE schema_version (version INTEGER NOT NULL)")
+    conn.execute("INSERT INTO schema_version (version) VALUES (1)")
+    conn.execute(
+        """CREATE TABLE requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending','approved','denied','downloading','fulfilled','failed')),
+            content_type TEXT NOT NULL DEFAULT 'ebook', title TEXT NOT NULL, author TEXT,
+            year TEXT, cover_url TEXT, description TEXT, isbn_10 TEXT, isbn_13 TEXT,
+            provider TEXT, provider_id TEXT, series_name TEXT, series_position REAL,
+            admin_note TEXT, approved_by INTEGER, download_task_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            hidden_from_admin INTEGER DEFAULT 0
+        )"""
+    )
+    conn.execute("INSERT INTO requests (user_id, title) VALUES (1, 'Dune')")
+    conn.commit()
+    conn.close()
+
+    request_db = RequestDB(db_path)
+    request_db.initialize()
+
+    (row,) = request_db.list_requests(user_id=1)
+    assert row["title"] == "Dune"
+    assert request_db.has_active_duplicate(1, "ebook", title="DUNE")
+    assert request_db.update_request_status(row["id"], "cancelled")["status"] == "cancelled"
+    with request_db._connection() as conn:
+        version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
+    assert version == 7
+
+
+def test_get_request_counts_returns_every_status_and_total(db):
+    first = db.create_request(user_id=1, title="Dune")
+    db.create_request(user_id=1, title="Emma")
+    db.create_request(user_id=2, title="Hyperion")
+    db.update_request_status(first["id"], "fulfilled")
+
+    counts = db.get_request_counts()
+    assert list(counts) == [
+        "pending", "approved", "denied", "downloading", "fulfilled",
+        "failed", "cancelled", "prerelease_requested", "total",
+    ]
+    assert counts["pending"] == 2
+    assert counts["fulfilled"] == 1
+    assert counts["total"] == 3
+
+    own = db.get_request_counts(user_id=2)
+    assert own["pending"] == 1
+    assert own["fulfilled"] == 0
+    assert own["total"] == 1
+
+
+def test_close_runs_pragma_optimize(db):
+    statements = []
+    with db._connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    db.close()
+
+    assert "PRAGMA optimize" in statements
+
+
+def test_get_unviewed_count_uses_last_viewed_timestamp(db):
+    req = db.create_request(user_id=1, title="Dune")
+    db.create_request(user_id=1, title="Emma")
+    db.create_request(user_id=2, title="Hyperion")
+
+    assert db.get_unviewed_count(1) == 2
+
+    with db._connection() as conn, conn:
+        conn.execute("UPDATE requests SET updated_at = '2020-01-01 00:00:00'")
+        conn.execute("UPDATE users SET requests_last_viewed_at = '2021-01-01 00:00:00'")
+        conn.execute(
+            "UPDATE requests SET updated_at = '2022-01-01 00:00:00' WHERE id = ?", (req["id"],)
+        )
+
+    assert db.get_unviewed_count(1) == 1
+    assert db.get_unviewed_count(2) == 0
+    assert db.get_unviewed_count(999) == 0
+
+
+def test_writes_leave_no_open_transaction(db):
+    req = db.create_request(user_id=1, title="Dune")
+    db.update_request_status(req["id"], "approved")
+    db.hide_request_from_admin(req["id"])
+
+    with db._connection() as conn:
+        assert conn.in_transaction is False
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(db.get_request(req["id"])))
+    worker.start()
+    worker.join()
+    assert seen[0]["hidden_from_admin"] == 1
+
+
+def test_has_active_duplicate_matches_provider_or_title(db):
+    db.create_request(user_id=1, title="Dune", provider="hardcover", provider_id="42")
+    emma = db.create_request(user_id=1, title="Emma")
+    db.update_request_status(emma["id"], "prerelease_requested")
+    done = db.create_request(user_id=1, title="Ubik")
+    db.update_request_status(done["id"], "fulfilled")
+
+    assert db.has_active_duplicate(1, "ebook", provider="hardcover", provider_id="42")
+    assert not db.has_active_duplicate(1, "audiobook", provider="hardcover", provider_id="42")
+    assert not db.has_active_duplicate(2, "ebook", provider="hardcover", provider_id="42")
+    # Provider matches take precedence over the title when both ids are given.
+    assert not db.has_active_duplicate(1, "ebook", provider="hardcover", provider_id="7", title="Dune")
+
+    assert db.has_active_duplicate(1, "ebook", title="dUNE")
+    assert db.has_active_duplicate(1, "ebook", title="EMMA")
+    assert not db.has_active_duplicate(1, "ebook", title="Ubik")
+
+
+def test_has_active_duplicate_folds_non_ascii_titles(db):
+    db.create_request(user_id=1, title="ÉMILE Zola")
+    db.create_requests_bulk([{"user_id": 1, "title": "Война и мир"}])
+
+    assert db.has_active_duplicate(1, "ebook", title="émile zola")
+    assert db.has_active_duplicate(1, "ebook", title="ВОЙНА И МИР")
+
+
+def test_has_active_duplicate_uses_indexes(db):
+    from shelfmark.core.request_db import _DUPLICATE_BY_PROVIDER_SQL, _DUPLICATE_BY_TITLE_SQL
+
+    plan = _query_plan(db, _DUPLICATE_BY_PROVIDER_SQL, (1, "hardcover", "42", "ebook"))
+    assert "idx_requests_active_provider" in plan
+    plan = _query_plan(db, _DUPLICATE_BY_TITLE_SQL, (1, "Dune", "ebook"))
+    assert "idx_requests_active_title" in plan
+
+
+def test_list_requests_keyset_pages_match_offset_pages(db):
+    for i in range(7):
+        db.create_request(user_id=1 + i % 2, title=f"Book {i}")
+    # Same-second timestamps: the id tiebreaker keeps pages disjoint.
+    with db._connection() as conn:
+        conn.execute("UPDATE requests SET created_at = '2025-01-01 00:00:00'")
+
+    expected = [r["id"] for r in db.list_requests(limit=100)]
+    seen = []
+    after = None
+    while True:
+        page = db.list_requests_keyset(limit=3, after=after)
+        seen.extend(r["id"] for r in page)
+        if len(page) < 3:
+            break
+        after = (page[-1]["created_at"], page[-1]["id"])
+    assert seen == expected
+
+    alice_first = db.list_requests_keyset(user_id=1, limit=2)
+    alice_rest = db.list_requests_keyset(
+        user_id=1, limit=10, after=(alice_first[-1]["created_at"], alice_first[-1]["id"])
+    )
+    assert [r["id"] for r in alice_first + alice_rest] == [
+        r["id"] for r in db.list_requests(user_id=1)
+    ]
+
+
+@pytest.mark.parametrize("has_cursor", [False, True])
+def test_unfiltered_keyset_list_walks_the_created_index(db, has_cursor):
+    from shelfmark.core.request_db import _LIST_KEYSET_SQL
+
+    for i in range(5):
+        db.create_request(user_id=1, title=f"Book {i}")
+    params = ("2025-01-01 00:00:00", 3, 10) if has_cursor else (10,)
+
+    plan = _query_plan(db, _LIST_KEYSET_SQL[(False, False, True, has_cursor)], params)
+
+    assert "idx_requests_created" in plan
+    assert "TEMP B-TREE" not in plan
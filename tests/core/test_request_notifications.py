@@ -8,7 +8,7 @@ def test_send_request_notification_supports_activated_status():
     smtp_config = SimpleNamespace(from_addr="Shelfmark <noreply@example.com>")
     with patch("shelfmark.core.request_notifications._is_notification_enabled", return_value=True), \
          patch("shelfmark.core.request_notifications._get_smtp_config", return_value=smtp_config), \
-         patch("shelfmark.download.outputs.email.send_email_message") as mock_send:
+         patch("shelfmark.core.request_notifications._smtp_pool.send") as mock_send:
         result = send_request_notification(
             user_email="reader@example.com",
             request_title="Future Book",
@@ -20,3 +20,185 @@ def test_send_request_notification_supports_activated_status():
     message = mock_send.call_args[0][1]
     assert message["Subject"] == "Request Activated: Future Book"
     assert "now active" in message.get_content().lower()
+
+
+class _FakeSMTP:
+    def __init__(self):
+        self.sent = []
+        self.rset_calls = 0
+        self.closed = False
+
+    def rset(self):
+        self.rset_calls += 1
+        return (250, b"OK")
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+
+def _message(subject="Hi"):
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    return msg
+
+
+def test_smtp_pool_reuses_connection_across_messages():
+    from shelfmark.core.request_notifications import _SMTPPool
+
+    conn = _FakeSMTP()
+    pool = _SMTPPool()
+    config = SimpleNamespace(host="smtp.example.com")
+    with patch("shelfmark.download.outputs.email.open_smtp_connection", return_value=conn) as opener, \
+         patch("shelfmark.download.outputs.email.close_smtp_connection"):
+        pool.send(config, _message("one"))
+        pool.send(config, _message("two"))
+
+    assert opener.call_count == 1
+    assert conn.rset_calls == 1
+    assert [m["Subject"] for m in conn.sent] == ["one", "two"]
+
+
+def test_smtp_pool_reconnects_when_server_dropped_connection():
+    import smtplib
+
+    from shelfmark.core.request_notifications import _SMTPPool
+
+    stale = _FakeSMTP()
+    stale.rset = lambda: (_ for _ in ()).throw(smtplib.SMTPServerDisconnected("gone"))
+    fresh = _FakeSMTP()
+    pool = _SMTPPool()
+    config = SimpleNamespace(host="smtp.example.com")
+    with patch("shelfmark.download.outputs.email.open_smtp_connection", side_effect=[stale, fresh]), \
+         patch("shelfmark.download.outputs.email.close_smtp_connection") as closer:
+        pool.send(config, _message("one"))
+        pool.send(config, _message("two"))
+
+    closer.assert_called_once_with(stale)
+    assert [m["Subject"] for m in stale.sent] == ["one"]
+    assert [m["Subject"] for m in fresh.sent] == ["two"]
+
+
+def test_smtp_pool_opens_new_connection_when_config_changes():
+    from shelfmark.core.request_notifications import _SMTPPool
+
+    first, second = _FakeSMTP(), _FakeSMTP()
+    pool = _SMTPPool()
+    with patch("shelfmark.download.outputs.email.open_smtp_connection", side_effect=[first, second]), \
+         patch("shelfmark.download.outputs.email.close_smtp_connection") as closer:
+        pool.send(SimpleNamespace(host="a"), _message())
+        pool.send(SimpleNamespace(host="b"), _message())
+
+    closer.assert_called_once_with(first)
+    assert len(second.sent) == 1
+
+
+def test_send_request_notifications_combines_updates_into_one_email():
+    from shelfmark.core.request_notifications import send_request_notifications
+
+    smtp_config = SimpleNamespace(from_addr="Shelfmark <noreply@example.com>")
+    with patch("shelfmark.core.request_notifications._is_notification_enabled", return_value=True), \
+         patch("shelfmark.core.request_notifications._get_smtp_config", return_value=smtp_config), \
+         patch("shelfmark.core.request_notifications._smtp_pool.send") as mock_send:
+        result = send_request_notifications(
+            "reader@example.com",
+            [("Book One", "approved", None), ("Book Two", "denied", "Not available")],
+        )
+
+    assert result is True
+    assert mock_send.call_count == 1
+    message = mock_send.call_args[0][1]
+    assert message["Subject"] == "2 request updates"
+    content = message.get_content()
+    assert "Book: Book One" in content
+    assert "Book: Book Two" in content
+    assert "Note from admin: Not available" in content
+
+
+def test_status_notifications_are_queued_and_coalesced_per_user():
+    from unittest.mock import MagicMock
+
+    from shelfmark.core import request_routes
+    from shelfmark.core.notification_queue import wait_until_idle
+
+    user_db = MagicMock()
+    user_db.get_user.side_effect = lambda user_id: {"id": user_id, "email": f"user{user_id}@example.com"}
+
+    with patch("shelfmark.core.request_routes.send_request_notifications") as mock_send:
+        request_routes._deliver_status_notifications([
+            (user_db, {"id": 1, "user_id": 1, "title": "Book One"}, "approved", None),
+            (user_db, {"id": 2, "user_id": 2, "title": "Book Two"}, "denied", "No"),
+            (user_db, {"id": 3, "user_id": 1, "title": "Book Three"}, "fulfilled", None),
+            (user_db, {"id": 4, "title": "Orphan"}, "approved", None),
+        ])
+        request_routes._send_status_notification(user_db, {"id": 5, "user_id": 2, "title": "Late"}, "approved")
+        wait_until_idle()
+
+    calls = [c.args for c in mock_send.call_args_list]
+    assert calls[0] == (
+        "user1@example.com",
+        [("Book One", "approved", None), ("Book Three", "fulfilled", None)],
+    )
+    assert calls[1] == ("user2@example.com", [("Book Two", "denied", "No")])
+    assert calls[2] == ("user2@example.com", [("Late", "approved", None)])
+
+
+def test_request_notification_body_layout():
+    from shelfmark.core.request_notifications import send_request_notification
+
+    smtp_config = SimpleNamespace(from_addr="noreply@example.com")
+    with patch("shelfmark.core.request_notifications._is_notification_enabled", return_value=True), \
+         patch("shelfmark.core.request_notifications._get_smtp_config", return_value=smtp_config), \
+         patch("shelfmark.core.request_notifications._smtp_pool.send") as mock_send:
+        send_request_notification("reader@example.com", "Dune {1}", "denied", admin_note="Out of print")
+        send_request_notification("reader@example.com", "Dune", "archived")
+
+    denied, unknown = (c.args[1].get_content() for c in mock_send.call_args_list)
+    assert denied == (
+        "Book: Dune {1}\nStatus: Denied\n\nYour book request has been denied."
+        "\n\nNote from admin: Out of print\n\n— Shelfmark\n"
+    )
+    assert unknown == (
+        "Book: Dune\nStatus: Archived\n\nYour request status has changed to: Archived."
+        "\n\n— Shelfmark\n"
+    )
+
+
+def test_request_notification_message_id_uses_sender_domain():
+    from shelfmark.core.request_notifications import send_request_notification
+    from shelfmark.download.outputs.email import msgid_domain
+
+    msgid_domain.cache_clear()
+    smtp_config = SimpleNamespace(from_addr="Shelfmark <noreply@books.example.org>")
+    with patch("shelfmark.core.request_notifications._is_notification_enabled", return_value=True), \
+         patch("shelfmark.core.request_notifications._get_smtp_config", return_value=smtp_config), \
+         patch("shelfmark.core.request_notifications._smtp_pool.send") as mock_send:
+        send_request_notification("reader@example.com", "Dune", "approved")
+        send_request_notification("reader@example.com", "Emma", "approved")
+
+    message_ids = [c.args[1]["Message-ID"] for c in mock_send.call_args_list]
+    assert all(mid.endswith("@books.example.org>") for mid in message_ids)
+    assert msgid_domain.cache_info().misses == 1
+
+
+def test_smtp_config_is_rebuilt_only_when_config_generation_changes():
+    from unittest.mock import PropertyMock
+
+    from shelfmark.core import request_notifications
+    from shelfmark.core.config import Config
+
+    request_notifications._smtp_config_cache = None
+    try:
+        with patch.object(Config, "generation", new_callable=PropertyMock, return_value=5) as generation, \
+             patch("shelfmark.download.outputs.email.build_email_smtp_config",
+                   side_effect=lambda settings: object()) as build:
+            first = request_notifications._get_smtp_config()
+            assert request_notifications._get_smtp_config() is first
+            assert build.call_count == 1
+
+            generation.return_value = 6
+            assert request_notifications._get_smtp_config() is not first
+            assert build.call_count == 2
+    finally:
+        request_notifications._smtp_config_cache = None
@@ -20,6 +20,7 @@ def _make_app(request_db, user_db):
 def app():
     request_db = MagicMock()
     request_db.list_requests.return_value = []
+    request_db.has_active_duplicate.return_value = False
     request_db.create_request.return_value = {
         "id": 1, "title": "The Hobbit", "status": "pending",
         "content_type": "audiobook", "author": "Tolkien",
@@ -0,0 +1,86 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_auth_cache():
+    from shelfmark.core import request_routes
+    request_routes._AUTH_MODE_CACHE.update(value=None, mtime=None)
+    yield
+    request_routes._AUTH_MODE_CACHE.update(value=None, mtime=None)
+
+
+def test_auth_mode_is_reread_only_after_security_file_changes(tmp_path):
+    from shelfmark.core.request_routes import _get_auth_mode
+
+    security = tmp_path / "security.json"
+    security.write_text(json.dumps({"AUTH_METHOD": "builtin"}))
+
+    with patch("shelfmark.core.settings_registry._get_config_file_path", return_value=security), \
+         patch("shelfmark.core.settings_registry.load_config_file",
+               side_effect=lambda tab: json.loads(security.read_text())) as load:
+        assert _get_auth_mode() == "builtin"
+        assert _get_auth_mode() == "builtin"
+        assert load.call_count == 1
+
+        security.write_text(json.dumps({"AUTH_METHOD": "none"}))
+        stat = security.stat()
+        os.utime(security, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert _get_auth_mode() == "none"
+        assert load.call_count == 2
+
+
+def test_auth_mode_defaults_to_none_when_config_unreadable():
+    from shelfmark.core.request_routes import _get_auth_mode
+
+    with patch("shelfmark.core.settings_registry._get_config_file_path", side_effect=RuntimeError):
+        assert _get_auth_mode() == "none"
+
+
+def test_auth_mode_is_resolved_once_per_request():
+    from unittest.mock import MagicMock
+
+    from flask import Flask
+    from shelfmark.core.request_routes import register_request_routes
+
+    request_db = MagicMock()
+    request_db.list_requests.return_value = []
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "test"
+    with patch("shelfmark.core.request_routes._get_auth_mode", return_value="builtin"):
+        register_request_routes(app, request_db, MagicMock())
+
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess.update(user_id="admin", db_user_id=1, is_admin=True)
+        with patch("shelfmark.core.request_routes._get_auth_mode", return_value="builtin") as auth_mode:
+            resp = client.get("/api/requests")
+            assert resp.status_code == 200
+            assert auth_mode.call_count == 1
+
+            client.get("/api/requests")
+            assert auth_mode.call_count == 2
+
+    request_db.list_requests.assert_called_with(user_id=None, status=None, limit=100, offset=0)
+
+
+def test_require_auth_rejects_missing_session_user():
+    from unittest.mock import MagicMock
+
+    from flask import Flask
+    from shelfmark.core.request_routes import register_request_routes
+
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "test"
+    with patch("shelfmark.core.request_routes._get_auth_mode", return_value="builtin"):
+        register_request_routes(app, MagicMock(), MagicMock())
+
+    with app.test_client() as client, \
+         patch("shelfmark.core.request_routes._get_auth_mode", return_value="builtin"):
+        assert client.get("/api/requests").status_code == 401
+        with client.session_transaction() as sess:
+            sess.update(user_id="reader", db_user_id=2, is_admin=False)
+        assert client.post("/api/requests/1/approve").status_code == 403
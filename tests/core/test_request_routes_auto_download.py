@@ -0,0 +1,178 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+
+class _Source:
+    def __init__(self, releases, delay=0.0, error=None):
+        self.releases = releases
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def search(self, book, plan, expand_search=False, content_type="ebook"):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return list(self.releases)
+
+
+@pytest.fixture(autouse=True)
+def _reset_config_caches():
+    from shelfmark.core import request_routes
+    request_routes._provider_cache = None
+    request_routes._enabled_sources_cache = None
+    yield
+    request_routes._provider_cache = None
+    request_routes._enabled_sources_cache = None
+
+
+@pytest.fixture
+def auto_download_env():
+    book = SimpleNamespace(
+        authors=["Frank Herbert"],
+        publish_year=1965,
+        cover_url=None,
+        series_name=None,
+        series_position=None,
+    )
+    provider = MagicMock()
+    provider.get_book.return_value = book
+    sources = {}
+
+    with patch("shelfmark.metadata_providers.is_provider_registered", return_value=True), \
+         patch("shelfmark.metadata_providers.get_provider_kwargs", return_value={}), \
+         patch("shelfmark.metadata_providers.get_provider", return_value=provider) as get_provider, \
+         patch("shelfmark.core.search_plan.build_release_search_plan", return_value=object()), \
+         patch("shelfmark.release_sources.list_available_sources",
+               side_effect=lambda: [{"name": name, "enabled": True} for name in sources]) as list_sources, \
+         patch("shelfmark.release_sources.get_source", side_effect=lambda name: sources[name]), \
+         patch("shelfmark.download.orchestrator.queue_release", return_value=(True, None)) as queue_release, \
+         patch("shelfmark.core.request_routes._broadcast_request_update"):
+        yield SimpleNamespace(
+            sources=sources,
+            queue_release=queue_release,
+            get_provider=get_provider,
+            list_sources=list_sources,
+        )
+
+
+def _run(request_db):
+    from shelfmark.core.request_routes import _auto_download_request
+
+    _auto_download_request(
+        request_db,
+        MagicMock(),
+        7,
+        {"provider": "hardcover", "provider_id": "1", "content_type": "ebook"},
+    )
+
+
+def _release(source_id):
+    from shelfmark.release_sources import Release
+
+    return Release(source="test", source_id=source_id, title=source_id)
+
+
+def test_sources_are_searched_concurrently_and_keep_priority_order(auto_download_env):
+    auto_download_env.sources["slow"] = _Source([_release("slow-1")], delay=0.3)
+    auto_download_env.sources["fast"] = _Source([_release("fast-1")])
+    request_db = MagicMock()
+
+    started = time.monotonic()
+    _run(request_db)
+
+    # The slow first source still wins because results are merged in source order.
+    queued = auto_download_env.queue_release.call_args.args[0]
+    assert queued["source_id"] == "slow-1"
+    request_db.update_request_status.assert_called_once_with(
+        7, "downloading", download_task_id="slow-1"
+    )
+    assert time.monotonic() - started < 0.6
+
+
+def test_failing_source_is_skipped(auto_download_env):
+    auto_download_env.sources["broken"] = _Source([], error=RuntimeError("boom"))
+    auto_download_env.sources["ok"] = _Source([_release("ok-1")])
+    request_db = MagicMock()
+
+    _run(request_db)
+
+    queued = auto_download_env.queue_release.call_args.args[0]
+    assert queued["source_id"] == "ok-1"
+
+
+def test_provider_is_reused_until_config_generation_changes(auto_download_env):
+    from shelfmark.core.config import Config
+
+    auto_download_env.sources["ok"] = _Source([_release("ok-1")])
+
+    with patch.object(Config, "generation", new_callable=PropertyMock, return_value=3) as generation:
+        _run(MagicMock())
+        _run(MagicMock())
+        assert auto_download_env.get_provider.call_count == 1
+
+        generation.return_value = 4
+        _run(MagicMock())
+        assert auto_download_env.get_provider.call_count == 2
+
+
+def test_unregistered_provider_fails_request(auto_download_env):
+    request_db = MagicMock()
+
+    with patch("shelfmark.metadata_providers.is_provider_registered", return_value=False):
+        _run(request_db)
+
+    assert request_db.update_request_status.call_args.args[1] == "failed"
+    auto_download_env.get_provider.assert_not_called()
+
+
+def test_does_not_wait_for_slower_lower_priority_sources(auto_download_env):
+    auto_download_env.sources["fast"] = _Source([_release("fast-1")])
+    auto_download_env.sources["slow"] = _Source([_release("slow-1")], delay=1.0)
+
+    started = time.monotonic()
+    _run(MagicMock())
+
+    assert auto_download_env.queue_release.call_args.args[0]["source_id"] == "fast-1"
+    assert time.monotonic() - started < 0.5
+
+
+def test_empty_priority_source_falls_through_to_next(auto_download_env):
+    auto_download_env.sources["empty"] = _Source([])
+    auto_download_env.sources["ok"] = _Source([_release("ok-1")], delay=0.05)
+
+    _run(MagicMock())
+
+    assert auto_download_env.queue_release.call_args.args[0]["source_id"] == "ok-1"
+
+
+def test_no_results_marks_request_failed(auto_download_env):
+    auto_download_env.sources["empty"] = _Source([])
+    auto_download_env.sources["broken"] = _Source([], error=RuntimeError("boom"))
+    request_db = MagicMock()
+
+    _run(request_db)
+
+    status_call = request_db.update_request_status.call_args
+    assert status_call.args[1] == "failed"
+    assert status_call.kwargs["admin_note"].startswith("Not found on empty.")
+    auto_download_env.queue_release.assert_not_called()
+
+
+def test_enabled_sources_are_cached_per_config_generation(auto_download_env):
+    from shelfmark.core.config import Config
+
+    auto_download_env.sources["ok"] = _Source([_release("ok-1")])
+
+    with patch.object(Config, "generation", new_callable=PropertyMock, return_value=3) as generation:
+        _run(MagicMock())
+        _run(MagicMock())
+        assert auto_download_env.list_sources.call_count == 1
+
+        generation.return_value = 4
+        _run(MagicMock())
+        assert auto_download_env.list_sources.call_count == 2
@@ -22,6 +22,7 @@ def _make_app(request_db, user_db):
 def app():
     request_db = MagicMock()
     request_db.list_requests.return_value = []
+    request_db.has_active_duplicate.return_value = False
     request_db.create_request.return_value = {
         "id": 1,
         "title": "Future Book",
@@ -122,14 +123,7 @@ class TestCreatePrereleaseRequests:
 
     def test_duplicate_prerelease_request_is_blocked(self, app):
         request_db = app.request_db
-        request_db.list_requests.return_value = [{
-            "id": 7,
-            "title": "Future Book",
-            "status": "prerelease_requested",
-            "content_type": "ebook",
-            "provider": "googlebooks",
-            "provider_id": "abc123",
-        }]
+        request_db.has_active_duplicate.return_value = True
 
         with app.test_client() as client:
             _set_user_session(client)
@@ -146,6 +140,14 @@ class TestCreatePrereleaseRequests:
 
         assert resp.status_code == 409
         assert "active request" in json.loads(resp.data)["error"].lower()
+        request_db.has_active_duplicate.assert_called_once_with(
+            1,
+            "ebook",
+            provider="googlebooks",
+            provider_id="abc123",
+            title="Future Book",
+        )
+        request_db.create_request.assert_not_called()
 
 
 class TestAdminPrereleaseTransitions:
@@ -270,3 +272,168 @@ class TestAdminPrereleaseTransitions:
         assert resp.status_code == 400
         assert "move-to-prerelease" in json.loads(resp.data)["error"]
         request_db.update_request_status.assert_not_called()
+
+    def test_status_route_fulfilled_uses_updated_row_without_refetch(self, app):
+        request_db = app.request_db
+        updated = {
+            "id": 1,
+            "title": "Future Book",
+            "status": "fulfilled",
+            "content_type": "ebook",
+            "author": "Future Author",
+            "user_id": 1,
+            "requester_username": "testuser",
+        }
+        request_db.update_request_status.return_value = updated
+
+        with app.test_client() as client:
+            _set_user_session(client, is_admin=True)
+            with patch("shelfmark.core.request_routes._broadcast_request_update"), \
+                 patch("shelfmark.core.request_routes._send_status_notification"), \
+                 patch("shelfmark.core.request_routes._send_discord_book_available") as mock_discord:
+                resp = client.put("/api/requests/1/status", json={"status": "fulfilled"})
+
+        assert resp.status_code == 200
+        mock_discord.assert_called_once_with(updated)
+        request_db.get_request.assert_called_once_with(1, include_users=False)
+
+    def test_status_route_returns_404_when_request_disappears(self, app):
+        request_db = app.request_db
+        request_db.update_request_status.return_value = None
+
+        with app.test_client() as client:
+            _set_user_session(client, is_admin=True)
+            with patch("shelfmark.core.request_routes._broadcast_request_update") as mock_broadcast:
+                resp = client.put("/api/requests/1/status", json={"status": "failed"})
+
+        assert resp.status_code == 404
+        mock_broadcast.assert_not_called()
+
+    def test_approve_submits_auto_download_to_shared_pool(self, app):
+        request_db = app.request_db
+        request_db.get_request.return_value = {
+            "id": 1,
+            "title": "Future Book",
+            "status": "pending",
+            "content_type": "ebook",
+            "user_id": 1,
+        }
+        request_db.update_request_status.return_value = {
+            "id": 1,
+            "title": "Future Book",
+            "status": "approved",
+            "content_type": "ebook",
+            "user_id": 1,
+        }
+
+        with app.test_client() as client:
+            _set_user_session(client, is_admin=True)
+            with patch("shelfmark.core.request_routes._broadcast_request_update"), \
+                 patch("shelfmark.core.request_routes._send_status_notification"), \
+                 patch("shelfmark.core.request_routes._download_executor") as mock_executor:
+                resp = client.post("/api/requests/1/approve")
+
+        assert resp.status_code == 200
+        mock_executor.submit.assert_called_once()
+        from shelfmark.core import request_routes
+        assert mock_executor.submit.call_args.args[0] is request_routes._auto_download_request
+        request_routes._release_download_slot(1)
+
+
+def test_download_slot_is_granted_to_exactly_one_caller():
+    import threading
+
+    from shelfmark.core.request_routes import _acquire_download_slot, _release_download_slot
+
+    barrier = threading.Barrier(16)
+    results = []
+
+    def _grab():
+        barrier.wait()
+        results.append(_acquire_download_slot(42))
+
+    threads = [threading.Thread(target=_grab) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(True) == 1
+    _release_download_slot(42)
+    assert _acquire_download_slot(42) is True
+    _release_download_slot(42)
+    _release_download_slot(42)
+
+
+class TestListRequestsRoute:
+    def test_cursor_paging_skips_count_unless_requested(self, app):
+        request_db = app.request_db
+        request_db.list_requests.return_value = [
+            {"id": 9, "created_at": "2025-01-02 00:00:00"},
+            {"id": 8, "created_at": "2025-01-01 00:00:00"},
+        ]
+        request_db.list_requests_keyset.return_value = [{"id": 7, "created_at": "2025-01-01 00:00:00"}]
+        request_db.count_requests.return_value = 3
+
+        with app.test_client() as client:
+            _set_user_session(client, is_admin=True)
+            first = json.loads(client.get("/api/requests?limit=2").data)
+            second = json.loads(
+                client.get("/api/requests", query_string={"limit": 2, "cursor": first["next_cursor"]}).data
+            )
+            with_total = json.loads(client.get("/api/requests?limit=2&include_total=1").data)
+            bad = client.get("/api/requests?cursor=nope")
+
+        assert first["next_cursor"] == "2025-01-01 00:00:00|8"
+        assert "total" not in first
+        request_db.list_requests_keyset.assert_called_once_with(
+            user_id=None, status=None, limit=2, after=("2025-01-01 00:00:00", 8)
+        )
+        assert second["next_cursor"] is None
+        assert with_total["total"] == 3
+        request_db.count_requests.assert_called_once()
+        assert bad.status_code == 400
+
+
+def test_broadcast_coalescer_batches_bursts():
+    import time
+
+    from shelfmark.core.request_routes import _BroadcastCoalescer
+
+    coalescer = _BroadcastCoalescer(0.05)
+    with patch("shelfmark.core.request_routes._emit_request_event") as mock_emit:
+        coalescer.add({"id": 1, "status": "approved"})
+        coalescer.add({"id": 2, "status": "approved"})
+        coalescer.add({"id": 2, "status": "downloading"})
+        coalescer.add({"id": 3, "status": "denied"})
+        assert mock_emit.call_count == 1
+        time.sleep(0.2)
+        coalescer.add({"id": 4, "status": "approved"})
+        time.sleep(0.2)
+
+    calls = [c.args for c in mock_emit.call_args_list]
+    assert calls == [
+        ("request_update", {"id": 1, "status": "approved"}),
+        ("request_updates", {"updates": [
+            {"id": 2, "status": "downloading"},
+            {"id": 3, "status": "denied"},
+        ]}),
+        ("request_update", {"id": 4, "status": "approved"}),
+    ]
+
+
+def test_list_and_detail_routes_return_json(app):
+    request_db = app.request_db
+    request_db.list_requests.return_value = [{"id": 1, "title": "Café", "created_at": "2025-01-01 00:00:00"}]
+    request_db.get_request_counts.return_value = {"pending": 1, "total": 1}
+
+    with app.test_client() as client:
+        _set_user_session(client, is_admin=True)
+        listed = client.get("/api/requests")
+        counts = client.get("/api/requests/counts")
+        detail = client.get("/api/requests/1")
+
+    assert listed.mimetype == "application/json"
+    assert listed.get_json()["requests"][0]["title"] == "Café"
+    assert counts.get_json() == {"pending": 1, "total": 1}
+    assert detail.get_json()["title"] == "Future Book"
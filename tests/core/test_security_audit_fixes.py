@@ -147,3 +147,21 @@ class TestCoverProxyValidation:
 
         assert resp.status_code == 400
         assert "invalid" in data["error"].lower()
+
+
+class TestRequestDbTerminalSync:
+    def test_completed_download_notifies_with_the_updated_row(self, main_module):
+        fulfilled = {"id": 3, "title": "Dune", "status": "fulfilled", "requester_username": "alice"}
+        fake_request_db = Mock()
+        fake_request_db.get_requests_by_download_task.return_value = [{"id": 3}]
+        fake_request_db.update_request_status.return_value = fulfilled
+
+        with patch.object(main_module, "request_db", fake_request_db):
+            with patch.object(main_module, "queue_discord_book_available") as mock_discord:
+                main_module._sync_request_db_on_terminal("task-1", main_module.QueueStatus.COMPLETE)
+
+        fake_request_db.update_request_status.assert_called_once_with(3, status="fulfilled")
+        fake_request_db.get_request.assert_not_called()
+        mock_discord.assert_called_once_with(
+            title="Dune", author=None, requester="alice", cover_url=None,
+        )
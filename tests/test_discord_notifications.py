@@ -3,6 +3,28 @@ import json
 from unittest.mock import MagicMock, patch, call
 import pytest
 
+_WEBHOOK = "https://discord.com/api/webhooks/123/token"
+
+
+@pytest.fixture
+def posted_payloads(monkeypatch):
+    """Capture decoded webhook payloads instead of posting them to Discord."""
+    from shelfmark.core import discord_notifications
+    payloads = []
+
+    def fake_post(url, data=None, headers=None, timeout=10):
+        payloads.append(json.loads(data))
+        return MagicMock(ok=True)
+
+    monkeypatch.setattr(discord_notifications._session, "post", fake_post)
+    return payloads
+
+
+def _use_settings(monkeypatch, **overrides):
+    from shelfmark.core import discord_notifications
+    settings = discord_notifications._DiscordSettings(**overrides)
+    monkeypatch.setattr(discord_notifications, "_load_discord_settings", lambda: settings)
+
 
 def test_build_new_request_embed_basic():
     from shelfmark.core.discord_notifications import build_new_request_embed
@@ -29,6 +51,7 @@ def test_build_new_request_embed_with_cover():
         content_type="audiobook", cover_url="https://example.com/cover.jpg"
     )
     assert embed.get("thumbnail") == {"url": "https://example.com/cover.jpg"}
+    assert "Author" not in {f["name"] for f in embed["fields"]}
 
 
 def test_build_new_request_embed_rejects_non_http_cover():
@@ -56,51 +79,28 @@ def test_build_book_available_embed():
 
 
 def test_send_discord_new_request_disabled(monkeypatch):
-    from shelfmark.core import discord_notifications
-    monkeypatch.setattr(discord_notifications, "_is_enabled", lambda: False)
+    _use_settings(monkeypatch, enabled=False)
     from shelfmark.core.discord_notifications import send_discord_new_request
     result = send_discord_new_request("Dune", author="Frank Herbert", requester="alice")
     assert result is False
 
 
 def test_send_discord_new_request_no_webhook(monkeypatch):
-    from shelfmark.core import discord_notifications
-    monkeypatch.setattr(discord_notifications, "_is_enabled", lambda: True)
-    monkeypatch.setattr(discord_notifications, "_get_webhook_url", lambda: None)
+    _use_settings(monkeypatch, enabled=True, webhook_url=None)
     from shelfmark.core.discord_notifications import send_discord_new_request
     result = send_discord_new_request("Dune", author=None, requester="alice")
     assert result is False
 
 
 def test_send_discord_new_request_notify_disabled(monkeypatch):
-    from shelfmark.core import discord_notifications
-    monkeypatch.setattr(discord_notifications, "_is_enabled", lambda: True)
-    monkeypatch.setattr(discord_notifications, "_get_webhook_url", lambda: "https://discord.com/api/webhooks/123/token")
-    monkeypatch.setattr(discord_notifications, "_get_notify_new_request", lambda: False)
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_new_request=False)
     from shelfmark.core.discord_notifications import send_discord_new_request
     result = send_discord_new_request("Dune", author=None, requester="alice")
     assert result is False
 
 
-def test_send_discord_new_request_fires_http(monkeypatch):
-    from shelfmark.core import discord_notifications
-    import urllib.request as urllib_request
-    monkeypatch.setattr(discord_notifications, "_is_enabled", lambda: True)
-    monkeypatch.setattr(discord_notifications, "_get_webhook_url", lambda: "https://discord.com/api/webhooks/123/token")
-    monkeypatch.setattr(discord_notifications, "_get_notify_new_request", lambda: True)
-
-    posted_payloads = []
-
-    class FakeResp:
-        def read(self): return b""
-        def __enter__(self): return self
-        def __exit__(self, *a): pass
-
-    def fake_urlopen(req, timeout=10):
-        posted_payloads.append(json.loads(req.data))
-        return FakeResp()
-
-    monkeypatch.setattr(urllib_request, "urlopen", fake_urlopen)
+def test_send_discord_new_request_fires_http(monkeypatch, posted_payloads):
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_new_request=True)
 
     from shelfmark.core.discord_notifications import send_discord_new_request
     result = send_discord_new_request("Dune", author="Frank Herbert", requester="alice", content_type="ebook")
@@ -109,25 +109,8 @@ def test_send_discord_new_request_fires_http(monkeypatch):
     assert posted_payloads[0]["embeds"][0]["title"] == "🔖 New Book Request"
 
 
-def test_send_discord_book_available_fires(monkeypatch):
-    from shelfmark.core import discord_notifications
-    import urllib.request as urllib_request
-    monkeypatch.setattr(discord_notifications, "_is_enabled", lambda: True)
-    monkeypatch.setattr(discord_notifications, "_get_webhook_url", lambda: "https://discord.com/api/webhooks/123/token")
-    monkeypatch.setattr(discord_notifications, "_get_notify_book_available", lambda: True)
-
-    posted_payloads = []
-
-    class FakeResp:
-        def read(self): return b""
-        def __enter__(self): return self
-        def __exit__(self, *a): pass
-
-    def fake_urlopen(req, timeout=10):
-        posted_payloads.append(json.loads(req.data))
-        return FakeResp()
-
-    monkeypatch.setattr(urllib_request, "urlopen", fake_urlopen)
+def test_send_discord_book_available_fires(monkeypatch, posted_payloads):
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_book_available=True)
 
     from shelfmark.core.discord_notifications import send_discord_book_available
     result = send_discord_book_available("Foundation", author="Asimov", requester="charlie")
@@ -135,6 +118,18 @@ def test_send_discord_book_available_fires(monkeypatch):
     assert posted_payloads[0]["embeds"][0]["title"] == "📗 Book Now Available"
 
 
+def test_send_discord_new_request_http_error(monkeypatch):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_new_request=True)
+    monkeypatch.setattr(
+        discord_notifications._session, "post",
+        lambda url, data=None, headers=None, timeout=10: MagicMock(ok=False, status_code=404, text="Unknown Webhook"),
+    )
+
+    from shelfmark.core.discord_notifications import send_discord_new_request
+    assert send_discord_new_request("Dune", author=None, requester="alice") is False
+
+
 def test_test_discord_connection_no_url():
     from shelfmark.core.discord_notifications import test_discord_connection
     result = test_discord_connection({})
@@ -173,3 +168,237 @@ def test_build_new_request_embed_no_version_field_when_false():
     )
     fields = {f["name"]: f["value"] for f in embed["fields"]}
     assert "Version" not in fields
+
+
+def test_discord_settings_cached_until_config_refresh(monkeypatch):
+    from shelfmark.core import discord_notifications
+
+    class FakeConfig:
+        generation = 1
+        values = {
+            "DISCORD_WEBHOOK_ENABLED": True,
+            "DISCORD_WEBHOOK_URL": "https://discord.com/api/webhooks/1/a",
+        }
+        calls = 0
+
+        def get(self, key, default=None):
+            FakeConfig.calls += 1
+            return self.values.get(key, default)
+
+    fake = FakeConfig()
+    monkeypatch.setattr(discord_notifications, "config", fake)
+    monkeypatch.setattr(discord_notifications, "_settings_cache", None)
+
+    settings = discord_notifications._load_discord_settings()
+    assert settings.enabled is True
+    calls = FakeConfig.calls
+    assert discord_notifications._load_discord_settings() is settings
+    assert settings.webhook_url == "https://discord.com/api/webhooks/1/a"
+    assert settings.notify_new_request is True
+    assert FakeConfig.calls == calls
+
+    fake.values = {"DISCORD_WEBHOOK_ENABLED": False}
+    fake.generation = 2
+    settings = discord_notifications._load_discord_settings()
+    assert settings.enabled is False
+    assert settings.webhook_url is None
+
+
+def test_send_discord_embeds_chunks_by_ten(monkeypatch, posted_payloads):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK)
+
+    embeds = [{"title": f"Book {i}"} for i in range(12)]
+    assert discord_notifications.send_discord_embeds(embeds) is True
+    assert [len(p["embeds"]) for p in posted_payloads] == [10, 2]
+
+
+def test_queue_discord_new_request_enqueues_embed(monkeypatch):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_new_request=True)
+    queued = []
+    monkeypatch.setattr(
+        discord_notifications, "enqueue_batched",
+        lambda label, func, item: queued.append((func, item)) or True,
+    )
+
+    assert discord_notifications.queue_discord_new_request("Dune", requester="alice") is True
+    assert queued[0][0] is discord_notifications.send_discord_embeds
+    assert queued[0][1]["title"] == "🔖 New Book Request"
+
+
+def test_queued_discord_notifications_share_one_post(monkeypatch, posted_payloads):
+    from shelfmark.core import discord_notifications
+    from shelfmark.core.notification_queue import wait_until_idle
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_new_request=True, notify_book_available=True)
+
+    assert discord_notifications.queue_discord_new_request("Dune", requester="alice")
+    assert discord_notifications.queue_discord_book_available("Foundation", requester="bob")
+    wait_until_idle()
+
+    assert len(posted_payloads) == 1
+    assert [e["title"] for e in posted_payloads[0]["embeds"]] == [
+        "🔖 New Book Request", "📗 Book Now Available",
+    ]
+
+
+@pytest.mark.parametrize("url", [
+    "http://discord.com/api/webhooks/1/t",
+    "https://evil.com/api/webhooks/1/t",
+    "https://discord.com.evil.example/api/webhooks/1/t",
+    "https://discord.com/api/not-webhooks/1/t",
+])
+def test_test_discord_connection_rejects_non_webhook_urls(url):
+    from shelfmark.core.discord_notifications import test_discord_connection
+    assert test_discord_connection({"DISCORD_WEBHOOK_URL": url})["success"] is False
+
+
+@pytest.mark.parametrize("url", [
+    "https://discordapp.com/api/webhooks/1/t",
+    "https://ptb.discord.com/api/webhooks/1/t",
+    "https://canary.discord.com/api/webhooks/1/t",
+])
+def test_test_discord_connection_accepts_discord_hosts(monkeypatch, url):
+    from shelfmark.core import discord_notifications
+    posted = []
+    monkeypatch.setattr(
+        discord_notifications._session, "post",
+        lambda u, data=None, headers=None, timeout=10: posted.append(u) or MagicMock(),
+    )
+    assert discord_notifications.test_discord_connection({"DISCORD_WEBHOOK_URL": url})["success"] is True
+    assert posted == [url]
+
+
+def test_embed_fields_keep_order_and_skip_missing_values():
+    from shelfmark.core.discord_notifications import build_book_available_embed, build_new_request_embed
+    embed = build_new_request_embed(
+        title="Dune", author="Frank Herbert", requester=None,
+        content_type="audiobook", prefer_alternate_version=True,
+    )
+    assert [f["name"] for f in embed["fields"]] == ["Title", "Author", "Type", "Version"]
+    assert all(f["inline"] is True for f in embed["fields"])
+
+    embed = build_book_available_embed(title="Foundation", author=None, requester="charlie")
+    assert [f["name"] for f in embed["fields"]] == ["Title", "Requested by"]
+
+
+def test_queue_discord_new_request_skips_embed_when_nothing_would_send(monkeypatch):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=None)
+    build = MagicMock()
+    monkeypatch.setattr(discord_notifications, "build_new_request_embed", build)
+
+    assert discord_notifications.queue_discord_new_request("Dune") is False
+    build.assert_not_called()
+
+
+def test_route_helper_skips_requester_lookup_when_discord_is_off(monkeypatch):
+    from shelfmark.core import request_routes
+    _use_settings(monkeypatch, enabled=False)
+    user_db = MagicMock()
+
+    request_routes._send_discord_new_request({"id": 1, "user_id": 7, "title": "Dune"}, user_db)
+
+    user_db.get_user.assert_not_called()
+
+
+def test_send_discord_bulk_available_posts_ten_embeds_per_call(monkeypatch, posted_payloads):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK)
+
+    books = [(f"Book {i}", None, "alice") for i in range(15)]
+    assert discord_notifications.send_discord_bulk_available(books) is True
+
+    assert [len(p["embeds"]) for p in posted_payloads] == [10, 5]
+    assert posted_payloads[1]["embeds"][-1]["fields"][0]["value"] == "Book 14"
+
+
+def test_send_discord_bulk_available_respects_notify_setting(monkeypatch, posted_payloads):
+    from shelfmark.core import discord_notifications
+    _use_settings(monkeypatch, enabled=True, webhook_url=_WEBHOOK, notify_book_available=False)
+
+    assert discord_notifications.send_discord_bulk_available([("Dune", None, None)]) is False
+    assert posted_payloads == []
+
+
+@pytest.fixture
+def webhook_server():
+    """Local webhook endpoint answering with scripted (status, headers) replies, then 204."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    import requests
+    from shelfmark.core import discord_notifications
+
+    replies = []
+    bodies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+            status, headers = replies.pop(0) if replies else (204, {})
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    # Same adapter (and retry policy) the module mounts for https webhooks.
+    session = requests.Session()
+    session.mount("http://", discord_notifications._session.get_adapter(_WEBHOOK))
+    try:
+        with patch.object(discord_notifications, "_session", session):
+            yield f"http://127.0.0.1:{server.server_port}/api/webhooks/1/t", replies, bodies
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unavailable_webhook_is_retried_with_the_same_body(webhook_server):
+    from shelfmark.core.discord_notifications import _post_embed
+    url, replies, bodies = webhook_server
+    replies.append((503, {}))
+
+    assert _post_embed(url, {"title": "Dune"}) is True
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+    assert json.loads(bodies[0]) == {"embeds": [{"title": "Dune"}]}
+
+
+@pytest.mark.parametrize("status", [502, 504])
+def test_gateway_errors_are_not_retried(webhook_server, status):
+    from shelfmark.core.discord_notifications import _post_embed
+    url, replies, bodies = webhook_server
+    replies.append((status, {}))
+
+    assert _post_embed(url, {"title": "Dune"}) is False
+    assert len(bodies) == 1
+
+
+def test_rate_limit_is_retried_after_retry_after(webhook_server):
+    from shelfmark.core.discord_notifications import _post_embed
+    url, replies, bodies = webhook_server
+    replies.append((429, {"Retry-After": "0"}))
+
+    assert _post_embed(url, {"title": "Dune"}) is True
+    assert len(bodies) == 2
+
+
+def test_long_rate_limit_gives_up_instead_of_waiting(webhook_server):
+    from shelfmark.core.discord_notifications import _post_embed
+    url, replies, bodies = webhook_server
+    replies.append((429, {"Retry-After": "3600"}))
+
+    assert _post_embed(url, {"title": "Dune"}) is False
+    assert len(bodies) == 1
+
+
+def test_read_timeouts_are_not_retried():
+    from shelfmark.core.discord_notifications import _session
+    assert _session.get_adapter(_WEBHOOK).max_retries.read == 0